@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from data_structures import SyntaxTree
+
+CACHE_FORMAT_VERSION = '1'
+DEFAULT_MAX_ENTRIES = 500000
+# Сколько обращений к записям накапливать перед записью времени доступа в базу
+ACCESS_FLUSH_INTERVAL = 256
+PIPELINE_PACKAGES = ('natasha', 'pymorphy2', 'pymorphy2-dicts-ru', 'ruwordnet')
+
+
+def package_versions():
+    """
+    Возвращает версии библиотек конвейера анализа.
+
+    Returns:
+        dict: Имя пакета → версия (или None, если пакет не установлен).
+    """
+    from importlib import metadata
+    versions = {}
+    for package in PIPELINE_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def file_digest(file_path):
+    """
+    Возвращает короткий хэш содержимого файла.
+    """
+    with open(file_path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def pipeline_version(role_rules=None, definition_index=False):
+    """
+    Возвращает строку версии конвейера: формат кэша, версии моделей и словарей,
+    хэш правил семантических ролей и источник определений слов.
+
+    Args:
+        role_rules (str, optional): Путь к файлу правил ролей (по умолчанию — semantic_roles.json).
+        definition_index (bool): Берутся ли определения из индекса wordnet_index.py, а не из RuWordNet.
+
+    Returns:
+        str: Строка версии.
+    """
+    if role_rules is None:
+        from semantic_analyzer import DEFAULT_ROLE_RULES
+        role_rules = DEFAULT_ROLE_RULES
+    versions = package_versions()
+    parts = [CACHE_FORMAT_VERSION] + [f"{name}={versions[name]}" for name in PIPELINE_PACKAGES]
+    parts.append(f"roles={file_digest(role_rules)}")
+    parts.append(f"definitions={'index' if definition_index else 'ruwordnet'}")
+    return ';'.join(parts)
+
+
+def default_cache_path():
+    """
+    Возвращает путь к файлу кэша в пользовательском каталоге кэша.
+    """
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'eyazis', 'analysis_cache.sqlite')
+
+
+class AnalysisCache:
+    """
+    Постоянный кэш результатов анализа предложений в SQLite с вытеснением по LRU.
+    Ключ — хэш текста предложения вместе с версией конвейера, поэтому обновление
+    моделей, словарей или правил ролей автоматически делает старые записи недоступными.
+    Время доступа к записям накапливается в памяти и записывается пачками.
+    """
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES, version=None,
+                 role_rules=None, definition_index=False):
+        """
+        Открывает (или создает) кэш.
+
+        Args:
+            path (str, optional): Путь к файлу кэша (по умолчанию — default_cache_path()).
+            max_entries (int): Максимальное количество записей.
+            version (str, optional): Версия конвейера (по умолчанию — pipeline_version()).
+            role_rules (str, optional): Путь к файлу правил ролей для версии по умолчанию.
+            definition_index (bool): Используется ли индекс определений (для версии по умолчанию).
+
+        Raises:
+            Exception: Если не удалось открыть кэш.
+        """
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.version = version or pipeline_version(role_rules, definition_index)
+        self.hits = 0
+        self.misses = 0
+        self._accessed = {}
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key BLOB PRIMARY KEY, trees TEXT NOT NULL, last_access REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+            self.conn.commit()
+            self._count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except Exception as e:
+            raise Exception(f"Ошибка открытия кэша анализа: {str(e)}")
+
+    def key(self, text):
+        """
+        Возвращает ключ записи для текста предложения.
+        """
+        return hashlib.blake2b(f"{self.version}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def get(self, text, tree_class=SyntaxTree):
+        """
+        Возвращает деревья, сохраненные для текста, или None.
+
+        Args:
+            text (str): Текст предложения.
+            tree_class (type): Класс создаваемых деревьев.
+
+        Returns:
+            list: Деревья (идентификаторы предложений нумеруются с 1) или None.
+        """
+        key = self.key(text)
+        row = self.conn.execute("SELECT trees FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._accessed[key] = time.time()
+        if len(self._accessed) >= ACCESS_FLUSH_INTERVAL:
+            self.flush()
+        return [tree_class.from_dict(tree_data) for tree_data in json.loads(row[0])]
+
+    def put(self, text, trees):
+        """
+        Сохраняет деревья предложения и при необходимости вытесняет давно не использованные записи.
+
+        Args:
+            text (str): Текст предложения.
+            trees (list): Деревья, полученные при анализе текста.
+        """
+        key = self.key(text)
+        data = json.dumps([tree.to_dict() for tree in trees], ensure_ascii=False)
+        exists = self.conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries (key, trees, last_access) VALUES (?, ?, ?)",
+            (key, data, time.time())
+        )
+        self._accessed.pop(key, None)
+        if not exists:
+            self._count += 1
+        self._write_accessed()
+        if self._count > self.max_entries:
+            self._evict()
+        self.conn.commit()
+
+    def _write_accessed(self):
+        if self._accessed:
+            self.conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                                  [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def flush(self):
+        """
+        Записывает накопленное время доступа к записям.
+        """
+        self._write_accessed()
+        self.conn.commit()
+
+    def _evict(self):
+        """
+        Удаляет самые давние записи, оставляя около 90% от max_entries.
+        """
+        self._count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = self._count - int(self.max_entries * 0.9)
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY last_access LIMIT ?)", (excess,)
+            )
+            self._count -= excess
+
+    def invalidate(self):
+        """
+        Удаляет все записи кэша.
+        """
+        self._accessed.clear()
+        self.conn.execute("DELETE FROM entries")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        """
+        Закрывает соединение с кэшем, предварительно записав время доступа.
+        """
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from text_analyzer import TextAnalyzer
+
+MAX_BATCH_TEXTS = 32
+MAX_BATCH_CHARS = 200000
+BATCH_WAIT_MS = 10
+MAX_REQUEST_BYTES = 16 << 20
+
+STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+
+class AnalysisService:
+    """
+    Локальная служба анализа: держит один загруженный TextAnalyzer и объединяет
+    одновременные запросы в микропакеты для синтаксического анализатора.
+
+    Соединения принимаются сразу после запуска, а модели загружаются в фоне: пока они
+    загружаются, /health сообщает состояние 'loading', а запросы анализа ждут в очереди.
+
+    Протокол — HTTP/1.1 поверх TCP или Unix-сокета:
+        GET  /health   — состояние службы ('loading', 'ok' или 'error');
+        POST /analyze  — тело {"text": "..."} или {"texts": ["...", ...]}; ответ содержит
+                         узлы деревьев (SyntaxTree.to_dict) для каждого предложения.
+
+    Пример: curl --unix-socket /tmp/eyazis.sock -d '{"text": "Мама мыла раму."}' http://localhost/analyze
+    """
+    def __init__(self, analyzer, max_batch_texts=MAX_BATCH_TEXTS, max_batch_chars=MAX_BATCH_CHARS,
+                 batch_wait_ms=BATCH_WAIT_MS):
+        """
+        Args:
+            analyzer (TextAnalyzer): Анализатор (загружается при запуске службы).
+            max_batch_texts (int): Максимум текстов в одном микропакете.
+            max_batch_chars (int): Максимум символов в одном микропакете.
+            batch_wait_ms (float): Сколько ждать новых запросов после первого, прежде чем
+                запустить анализ пакета.
+        """
+        self.analyzer = analyzer
+        self.max_batch_texts = max_batch_texts
+        self.max_batch_chars = max_batch_chars
+        self.batch_wait = batch_wait_ms / 1000
+        self.requests = 0
+        self.batches = 0
+        self.started_at = None
+        self.load_error = None
+        self._queue = None
+        self._batcher = None
+        self._server = None
+        # Анализатор не рассчитан на параллельные вызовы: все пакеты идут через один поток
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        """
+        Начинает принимать соединения и загружает модели в фоне.
+
+        Args:
+            host (str): Адрес TCP.
+            port (int): Порт TCP.
+            unix_path (str, optional): Путь Unix-сокета; если указан, TCP не используется.
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        self.started_at = time.time()
+        return self._server
+
+    async def serve_forever(self, host='127.0.0.1', port=8765, unix_path=None):
+        """
+        Запускает службу и обслуживает запросы до остановки.
+        """
+        server = await self.start(host, port, unix_path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Останавливает прием соединений и обработку пакетов.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        self._executor.shutdown(wait=False)
+
+    async def analyze(self, texts):
+        """
+        Ставит тексты в очередь и дожидается результатов их микропакета.
+
+        Args:
+            texts (list): Непустые тексты.
+
+        Returns:
+            list: Для каждого текста — список деревьев.
+
+        Raises:
+            Exception: Если модели не удалось загрузить или текст не удалось проанализировать.
+        """
+        if self.load_error is not None:
+            raise Exception(f"Модели не загружены: {self.load_error}")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            await self._queue.put((text, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _run_batches(self):
+        """
+        Загружает модели, затем собирает запросы из очереди в микропакеты и анализирует
+        их в рабочем потоке. Запросы, пришедшие во время загрузки, ждут в очереди.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self.analyzer.load)
+        except Exception as e:
+            self.load_error = str(e)
+            while True:
+                _, future = await self._queue.get()
+                if not future.done():
+                    future.set_exception(Exception(f"Модели не загружены: {self.load_error}"))
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.max_batch_texts and size < self.max_batch_chars:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self.batches += 1
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.analyzer.analyze_batch, texts)
+            except Exception:
+                # Ошибка одного текста не должна затрагивать соседей по пакету
+                await self._analyze_separately(batch)
+                continue
+            for (_, future), trees in zip(batch, results):
+                if not future.done():
+                    future.set_result(trees)
+
+    async def _analyze_separately(self, batch):
+        """
+        Анализирует тексты неудавшегося микропакета по одному, чтобы ошибка
+        вернулась только запросу с проблемным текстом.
+        """
+        loop = asyncio.get_running_loop()
+        for text, future in batch:
+            try:
+                trees = (await loop.run_in_executor(self._executor, self.analyzer.analyze_batch, [text]))[0]
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(trees)
+
+    def health(self):
+        """
+        Возвращает состояние службы.
+        """
+        if self.load_error is not None:
+            status = 'error'
+        else:
+            status = 'ok' if self.analyzer.is_loaded else 'loading'
+        health = {
+            'status': status,
+            'uptime_seconds': time.time() - self.started_at if self.started_at else 0,
+            'requests': self.requests,
+            'batches': self.batches,
+            'queued': self._queue.qsize() if self._queue is not None else 0
+        }
+        if self.load_error is not None:
+            health['error'] = self.load_error
+        return health
+
+    async def _handle(self, reader, writer):
+        """
+        Обрабатывает одно HTTP-соединение (один запрос, затем соединение закрывается).
+        """
+        try:
+            status, payload = await self._dispatch(reader)
+        except Exception as e:
+            status, payload = 500, {'error': f"Ошибка службы анализа: {str(e)}"}
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n")
+        try:
+            writer.write(head.encode('ascii') + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader):
+        """
+        Разбирает HTTP-запрос и вызывает соответствующий обработчик.
+
+        Returns:
+            tuple: (код ответа, данные ответа).
+        """
+        request_line = (await reader.readline()).decode('latin-1').split()
+        if len(request_line) < 2:
+            return 400, {'error': "Некорректный запрос"}
+        method, path = request_line[0].upper(), request_line[1].split('?', 1)[0]
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if path == '/health':
+            return 200, self.health()
+        if path != '/analyze':
+            return 404, {'error': f"Неизвестный путь: {path}"}
+        if method != 'POST':
+            return 405, {'error': "Используйте POST"}
+
+        if self.load_error is not None:
+            return 503, {'error': f"Модели не загружены: {self.load_error}"}
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            return 400, {'error': "Некорректный заголовок Content-Length"}
+        if length < 0:
+            return 400, {'error': "Некорректный заголовок Content-Length"}
+        if length > MAX_REQUEST_BYTES:
+            return 413, {'error': "Слишком большой запрос"}
+        try:
+            request = json.loads(await reader.readexactly(length))
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            return 400, {'error': f"Некорректный JSON: {str(e)}"}
+        if not isinstance(request, dict):
+            return 400, {'error': "Ожидается объект JSON с полем text или texts"}
+        single = 'texts' not in request
+        texts = [request.get('text')] if single else request['texts']
+        if not isinstance(texts, list) or any(not isinstance(text, str) or not text.strip() for text in texts):
+            return 400, {'error': "Входной текст пуст"}
+
+        self.requests += 1
+        results = await self.analyze(texts)
+        documents = [[tree.to_dict() for tree in trees] for trees in results]
+        return 200, {'results': documents[0]} if single else {'results': documents}
+
+
+def main():
+    """
+    Запускает службу анализа из командной строки.
+    """
+    parser = argparse.ArgumentParser(description="Локальная служба синтаксического и семантического анализа")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес TCP")
+    parser.add_argument("--port", type=int, default=8765, help="Порт TCP")
+    parser.add_argument("--unix", default=None, help="Путь Unix-сокета вместо TCP")
+    parser.add_argument("--definition-index", default=None, help="Индекс определений RuWordNet")
+    parser.add_argument("--batch-texts", type=int, default=MAX_BATCH_TEXTS, help="Текстов в микропакете")
+    parser.add_argument("--batch-wait-ms", type=float, default=BATCH_WAIT_MS,
+                        help="Ожидание новых запросов перед анализом пакета, мс")
+    args = parser.parse_args()
+
+    analyzer = TextAnalyzer(definition_index=args.definition_index, lazy=True)
+    service = AnalysisService(analyzer, max_batch_texts=args.batch_texts, batch_wait_ms=args.batch_wait_ms)
+    address = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Служба анализа запускается: {address}")
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
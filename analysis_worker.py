@@ -0,0 +1,98 @@
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+class AnalysisWorker(QObject):
+    """
+    Выполняет анализ текста в отдельном потоке и сообщает о готовых предложениях.
+    """
+    sentence_ready = pyqtSignal(int, object)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, analyzer, text=None, paragraphs=None):
+        """
+        Args:
+            analyzer (TextAnalyzer | IncrementalAnalyzer): Анализатор текста.
+            text (str, optional): Текст для анализа.
+            paragraphs (iterable, optional): Абзацы, читаемые потоково (например,
+                readers.iter_paragraphs); используются вместо text. Общее число
+                предложений заранее неизвестно, поэтому в progress передается 0.
+        """
+        super().__init__()
+        self.analyzer = analyzer
+        self.text = text
+        self.paragraphs = paragraphs
+        self._cancel_requested = False
+
+    def cancel(self):
+        """
+        Запрашивает остановку анализа перед следующим предложением.
+        """
+        self._cancel_requested = True
+
+    @pyqtSlot()
+    def run(self):
+        """
+        Анализирует текст по предложениям, испуская сигналы прогресса.
+        Текст (или каждый абзац) сегментируется один раз, флаг отмены проверяется
+        перед каждым предложением.
+        """
+        try:
+            if self.paragraphs is None:
+                sentences = self.analyzer.split_sentences(self.text)
+                total = len(sentences)
+                groups = [sentences]
+            else:
+                total = 0
+                groups = (self.analyzer.split_sentences(paragraph)
+                          for paragraph in self.paragraphs if paragraph.strip())
+            self.progress.emit(0, total)
+            count = 0
+            done = 0
+            for sentences in groups:
+                for sentence in sentences:
+                    if self._cancel_requested:
+                        self.cancelled.emit()
+                        return
+                    for tree in self.analyzer.iter_analyze_sentences([sentence], count + 1):
+                        self.sentence_ready.emit(count, tree)
+                        count += 1
+                    done += 1
+                    self.progress.emit(done, total)
+            self.finished.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            # Закрывает файл, если поток абзацев прочитан не до конца
+            close = getattr(self.paragraphs, 'close', None)
+            if close is not None:
+                close()
+
+
+class ModelLoader(QObject):
+    """
+    Загружает модели анализатора в фоновом потоке после показа окна.
+    """
+    loaded = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, analyzer):
+        """
+        Args:
+            analyzer (TextAnalyzer): Анализатор, созданный с lazy=True.
+        """
+        super().__init__()
+        self.analyzer = analyzer
+
+    @pyqtSlot()
+    def run(self):
+        """
+        Загружает модели и сообщает о результате.
+        """
+        try:
+            self.analyzer.load()
+            self.loaded.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,271 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from readers import iter_paragraphs, iter_documents, is_multi_document
+from worker_bootstrap import share_models_default, fork_context, preload_analyzer, memory_rollup
+
+_worker_analyzer = None
+_shared_analyzer = None
+_shared_definition_index = None
+
+# Сколько пачек документов держать в очереди на процесс-обработчик
+PENDING_CHUNKS_PER_WORKER = 2
+
+
+def _init_worker(definition_index, cache_path, shared=False):
+    """
+    Инициализирует анализатор в процессе-обработчике один раз за время его жизни.
+    Если shared, используется анализатор, загруженный родительским процессом до fork.
+    """
+    global _worker_analyzer
+    if shared:
+        _worker_analyzer = _shared_analyzer
+        _worker_analyzer.semantic_analyzer.reconnect()
+    else:
+        from text_analyzer import TextAnalyzer
+        _worker_analyzer = TextAnalyzer(definition_index=definition_index)
+    if cache_path:
+        from analysis_cache import AnalysisCache
+        from incremental_analyzer import IncrementalAnalyzer
+        _worker_analyzer = IncrementalAnalyzer(_worker_analyzer, persistent_cache=AnalysisCache(
+            cache_path, definition_index=bool(definition_index)))
+
+
+def _check_cache(cache_path, definition_index):
+    """
+    Открывает постоянный кэш в родительском процессе, чтобы ошибка (например, путь к файлу,
+    который не является базой SQLite) была видна до запуска пула, а не обрывала процессы-обработчики.
+    """
+    from analysis_cache import AnalysisCache
+    AnalysisCache(cache_path, definition_index=bool(definition_index)).close()
+
+
+def _analyze_source(source):
+    """
+    Анализирует один документ в процессе-обработчике.
+    Файлы читаются потоково по абзацам и целиком в память не загружаются.
+
+    Args:
+        source (tuple): ('file', путь к файлу) или ('text', текст документа).
+    """
+    kind, value = source
+    if kind == 'text':
+        return _worker_analyzer.analyze(value)
+    results = list(_worker_analyzer.iter_analyze_paragraphs(iter_paragraphs(value)))
+    if not results:
+        raise Exception(f"Ошибка при чтении файла: {value} пуст или содержит некорректные данные")
+    return results
+
+
+def _analyze_chunk(sources, memory=False, statistics=False):
+    """
+    Анализирует пачку документов и добавляет к результатам сводку памяти
+    процесса-обработчика и статистику документов, посчитанную в этом же процессе.
+    """
+    results = [_analyze_source(source) for source in sources]
+    stats = None
+    if statistics:
+        from corpus_stats import CorpusStatistics
+        stats = CorpusStatistics()
+        for trees in results:
+            for tree in trees:
+                stats.add_tree(tree)
+    return results, os.getpid(), memory_rollup() if memory else None, stats
+
+
+def _preload_shared(definition_index):
+    """
+    Загружает общий анализатор в родительском процессе (один раз для каждого индекса).
+    """
+    global _shared_analyzer, _shared_definition_index
+    if _shared_analyzer is None or _shared_definition_index != definition_index:
+        _shared_analyzer = preload_analyzer(definition_index)
+        _shared_definition_index = definition_index
+
+
+def _iter_chunks(items, chunksize):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _collect(keys, future, memory_report, statistics):
+    results, pid, rollup, stats = future.result()
+    if memory_report is not None:
+        memory_report[pid] = rollup
+    if statistics is not None:
+        statistics.merge(stats)
+    return zip(keys, results)
+
+
+def _iter_pool(items, workers=None, chunksize=1, definition_index=None, cache_path=None,
+               share_models=None, memory_report=None, statistics=None):
+    """
+    Анализирует документы в пуле процессов (параметры см. в iter_analyze_many).
+
+    Документы читаются из items по мере освобождения процессов: одновременно в работе
+    не больше PENDING_CHUNKS_PER_WORKER пачек на процесс, поэтому корпус не
+    загружается в память целиком.
+
+    Args:
+        items (iterable): Пары (ключ, источник), источник — ('file', путь) или ('text', текст).
+
+    Yields:
+        tuple: (ключ, список объектов SyntaxTree) в порядке items.
+    """
+    try:
+        chunks = _iter_chunks(items, chunksize)
+        workers = workers or os.cpu_count() or 1
+        head = list(islice(chunks, workers))
+        if not head:
+            return
+        workers = min(workers, len(head))
+        if cache_path:
+            _check_cache(cache_path, definition_index)
+        if share_models is None:
+            share_models = share_models_default()
+        options = {}
+        if share_models:
+            _preload_shared(definition_index)
+            options['mp_context'] = fork_context()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(definition_index, cache_path, share_models), **options) as executor:
+            task = partial(_analyze_chunk, memory=memory_report is not None, statistics=statistics is not None)
+            pending = deque()
+            for chunk in chain(head, chunks):
+                keys = [key for key, _ in chunk]
+                pending.append((keys, executor.submit(task, [source for _, source in chunk])))
+                if len(pending) < workers * PENDING_CHUNKS_PER_WORKER:
+                    continue
+                yield from _collect(*pending.popleft(), memory_report, statistics)
+            while pending:
+                yield from _collect(*pending.popleft(), memory_report, statistics)
+    except Exception as e:
+        raise Exception(f"Ошибка пакетного анализа: {str(e)}")
+
+
+def _iter_file_documents(files):
+    """
+    Выдает документы файлов: файл многодокументного формата (JSONL) читается здесь,
+    и каждая его запись становится отдельным документом, остальные файлы читаются
+    процессами-обработчиками.
+    """
+    for file_path in files:
+        if is_multi_document(file_path):
+            for number, text in iter_documents(file_path):
+                yield (file_path, number), ('text', text)
+        else:
+            yield (file_path, None), ('file', file_path)
+
+
+def iter_analyze_documents(files, workers=None, chunksize=1, definition_index=None, cache_path=None,
+                           share_models=None, memory_report=None, statistics=None):
+    """
+    Анализирует набор файлов в пуле процессов и выдает результаты по документам по мере готовности.
+
+    При share_models модели загружаются один раз в родительском процессе, а процессы
+    порождаются через fork и используют их страницы памяти совместно (см. worker_bootstrap.py).
+    Иначе каждый процесс загружает Natasha, pymorphy2 и RuWordNet сам и использует
+    их для всех доставшихся ему документов. Файлы читаются потоково по абзацам;
+    каждая запись многодокументного файла (JSONL) — отдельный документ.
+
+    Args:
+        files (iterable): Пути к файлам поддерживаемых форматов (см. readers.py).
+        workers (int, optional): Количество процессов (по умолчанию — число ядер).
+        chunksize (int): Сколько документов передавать процессу за раз.
+        definition_index (str, optional): Путь к индексу определений RuWordNet.
+        cache_path (str, optional): Путь к постоянному кэшу анализа (AnalysisCache);
+            уже разобранные предложения берутся из него.
+        share_models (bool, optional): Загрузить модели до fork и разделить их между процессами
+            (по умолчанию — только в Linux, см. worker_bootstrap.share_models_default).
+        memory_report (dict, optional): Заполняется сводками памяти процессов-обработчиков
+            (PID → memory_rollup после последнего документа).
+        statistics (CorpusStatistics, optional): Пополняется статистикой документов;
+            счетчики считаются в процессах-обработчиках и объединяются здесь.
+
+    Yields:
+        tuple: (путь к файлу, номер записи — номер ее строки в файле (см. readers.iter_documents)
+            или None для однодокументных файлов, список объектов SyntaxTree) в порядке files.
+
+    Raises:
+        FileNotFoundError: Если один из файлов не найден (проверяется до начала анализа).
+        Exception: Если произошла ошибка при анализе одного из документов.
+    """
+    files = list(files)
+    missing = [file_path for file_path in files if not os.path.isfile(file_path)]
+    if missing:
+        raise FileNotFoundError(f"Файлы не найдены: {', '.join(missing)}")
+    for (file_path, number), results in _iter_pool(_iter_file_documents(files), workers, chunksize,
+                                                    definition_index, cache_path, share_models,
+                                                    memory_report, statistics):
+        yield file_path, number, results
+
+
+def iter_analyze_many(files, workers=None, chunksize=1, definition_index=None, cache_path=None,
+                      share_models=None, memory_report=None, statistics=None):
+    """
+    Анализирует набор файлов в пуле процессов (параметры см. в iter_analyze_documents).
+
+    Yields:
+        list: Список объектов SyntaxTree для очередного документа: по одному на файл,
+            для многодокументных файлов — по одному на запись.
+    """
+    for _, _, results in iter_analyze_documents(files, workers, chunksize, definition_index, cache_path,
+                                                share_models, memory_report, statistics):
+        yield results
+
+
+def iter_analyze_texts(texts, workers=None, chunksize=1, definition_index=None, cache_path=None,
+                       share_models=None, memory_report=None, statistics=None):
+    """
+    Анализирует набор текстов в пуле процессов (параметры см. в iter_analyze_documents).
+
+    Yields:
+        list: Список объектов SyntaxTree для очередного текста.
+    """
+    for _, results in _iter_pool(((i, ('text', text)) for i, text in enumerate(texts)), workers, chunksize,
+                                 definition_index, cache_path, share_models, memory_report, statistics):
+        yield results
+
+
+def analyze_many(files, workers=None, chunksize=1, definition_index=None, cache_path=None,
+                 share_models=None):
+    """
+    Анализирует набор файлов в пуле процессов.
+
+    Args:
+        files (iterable): Пути к файлам поддерживаемых форматов (см. readers.py).
+        workers (int, optional): Количество процессов (по умолчанию — число ядер).
+        chunksize (int): Сколько документов передавать процессу за раз.
+        definition_index (str, optional): Путь к индексу определений RuWordNet.
+        cache_path (str, optional): Путь к постоянному кэшу анализа.
+        share_models (bool, optional): Разделить загруженные модели между процессами через fork.
+
+    Returns:
+        list: Списки объектов SyntaxTree по документам в том же порядке, что и files
+            (для многодокументных файлов — по одному на запись).
+
+    Raises:
+        FileNotFoundError: Если один из файлов не найден.
+    """
+    return list(iter_analyze_many(files, workers=workers, chunksize=chunksize,
+                                  definition_index=definition_index, cache_path=cache_path,
+                                  share_models=share_models))
+
+
+def analyze_texts(texts, workers=None, chunksize=1, definition_index=None, cache_path=None,
+                  share_models=None):
+    """
+    Анализирует набор текстов в пуле процессов.
+
+    Returns:
+        list: Списки объектов SyntaxTree в том же порядке, что и texts.
+    """
+    return list(iter_analyze_texts(texts, workers=workers, chunksize=chunksize,
+                                   definition_index=definition_index, cache_path=cache_path,
+                                   share_models=share_models))
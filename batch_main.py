@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+import time
+from batch_analyzer import iter_analyze_documents
+from result_manager import ResultManager
+from readers import expand_inputs, relative_names, is_multi_document
+from analysis_cache import AnalysisCache, default_cache_path
+from worker_bootstrap import memory_rollup, format_memory_report
+from corpus_stats import CorpusStatistics
+
+def find_name_conflicts(files, names):
+    """
+    Находит файлы, результаты которых были бы записаны под одним именем.
+
+    Результаты сохраняются под путем файла относительно общего каталога входных файлов
+    без расширения; записи многодокументного файла — под его именем с номером строки записи
+    ('corpus.jsonl' → 'corpus.1', 'corpus.2', ...).
+
+    Args:
+        files (list): Пути к файлам.
+        names (list): Имена результатов (см. readers.relative_names).
+
+    Returns:
+        list: Описания конфликтов (пустой список, если их нет).
+    """
+    owners = {}
+    conflicts = []
+    for file_path, name in zip(files, names):
+        key = os.path.normcase(name)
+        if key in owners:
+            conflicts.append(f"{owners[key]} и {file_path} → {name}")
+        owners[key] = file_path
+    for file_path, name in zip(files, names):
+        if is_multi_document(file_path):
+            continue
+        prefix, _, number = os.path.normcase(name).rpartition('.')
+        owner = owners.get(prefix)
+        if number.isdigit() and owner is not None and is_multi_document(owner):
+            conflicts.append(f"{owner} и {file_path} → {name}")
+    return conflicts
+
+def main():
+    """
+    Пакетный анализ файлов из командной строки с сохранением результатов в JSON, JSON Lines, CoNLL-U или бинарном формате.
+    """
+    parser = argparse.ArgumentParser(description="Пакетный синтаксический и семантический анализ текстовых корпусов")
+    parser.add_argument("inputs", nargs="+", help="Файлы (RTF, TXT, GZ, JSONL), каталоги или шаблоны glob")
+    parser.add_argument("-o", "--output-dir", default=".", help="Каталог для JSON-результатов")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Количество процессов")
+    parser.add_argument("-f", "--format", choices=["json", "jsonl", "bin", "conllu"], default="json",
+                        help="Формат сохранения результатов")
+    parser.add_argument("--definition-index", default=None, help="Индекс определений RuWordNet")
+    parser.add_argument("--cache", action="store_true", help="Использовать постоянный кэш анализа")
+    parser.add_argument("--cache-path", default=None,
+                        help="Файл постоянного кэша анализа (включает --cache; по умолчанию — кэш пользователя)")
+    parser.add_argument("--clear-cache", action="store_true", help="Очистить кэш перед запуском")
+    parser.add_argument("--share-models", dest="share_models", action="store_true", default=None,
+                        help="Загрузить модели до fork и разделить их между процессами (по умолчанию — только в Linux)")
+    parser.add_argument("--no-share-models", dest="share_models", action="store_false", default=None,
+                        help="Загружать модели в каждом процессе отдельно, без fork после загрузки")
+    parser.add_argument("--stats", default=None, help="JSON-файл для сводной статистики корпуса")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="Вывести общую и собственную память каждого процесса")
+    args = parser.parse_args()
+    cache_path = args.cache_path or default_cache_path() if args.cache or args.cache_path else None
+    if args.clear_cache and not cache_path:
+        parser.error("--clear-cache требует --cache")
+
+    if args.clear_cache:
+        cache = AnalysisCache(cache_path)
+        cache.invalidate()
+        cache.close()
+
+    files = expand_inputs(args.inputs)
+    names = relative_names(files)
+    conflicts = find_name_conflicts(files, names)
+    if conflicts:
+        parser.error("совпадают имена результатов: " + "; ".join(conflicts))
+    names = dict(zip(files, names))
+    os.makedirs(args.output_dir, exist_ok=True)
+    result_manager = ResultManager()
+    save = {
+        "json": result_manager.save_results,
+        "jsonl": result_manager.save_results_jsonl,
+        "bin": result_manager.save_results_binary,
+        "conllu": result_manager.save_results_conllu
+    }[args.format]
+    start_time = time.time()
+    memory_report = {} if args.memory_report else None
+    statistics = CorpusStatistics() if args.stats else None
+    documents = 0
+    try:
+        all_results = iter_analyze_documents(files, workers=args.workers,
+                                             definition_index=args.definition_index, cache_path=cache_path,
+                                             share_models=args.share_models, memory_report=memory_report,
+                                             statistics=statistics)
+        for file_path, number, results in all_results:
+            name = names[file_path] if number is None else f"{names[file_path]}.{number}"
+            output_path = os.path.join(args.output_dir, name + '.' + args.format)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            save(results, output_path)
+            documents += 1
+        if statistics is not None:
+            statistics.save(args.stats)
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    print(f"Обработано файлов: {len(files)}, документов: {documents}, время: {time.time() - start_time} секунд")
+    if memory_report is not None:
+        print(format_memory_report({'родитель': memory_rollup(), **memory_report}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import json
+import platform
+import random
+import resource
+import sys
+import time
+from rtf_reader import read_rtf_file
+from analysis_cache import package_versions
+
+SUBJECTS = ['Катя', 'Игорь', 'Старый мастер', 'Молодой художник', 'Учитель', 'Девочка']
+VERBS = ['читала', 'рисовал', 'открыл', 'нашел', 'увидела', 'принес']
+OBJECTS = ['интересную книгу', 'красочный пейзаж', 'старый альбом', 'деревянный стол', 'яркое окно']
+PLACES = ['в библиотеке', 'в мастерской', 'на большом холсте', 'в уютной комнате', 'у окна']
+
+
+def synthetic_corpus(sentences, seed=0):
+    """
+    Генерирует синтетический текст из простых повествовательных предложений.
+
+    Args:
+        sentences (int): Количество предложений.
+        seed (int): Зерно генератора для воспроизводимости.
+
+    Returns:
+        str: Текст.
+    """
+    rng = random.Random(seed)
+    return ' '.join(
+        f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(PLACES)}."
+        for _ in range(sentences)
+    )
+
+
+def sample_corpus(file_path, scale):
+    """
+    Возвращает текст RTF-файла, повторенный scale раз.
+    """
+    text = read_rtf_file(file_path)
+    return '\n'.join([text] * scale)
+
+
+def peak_rss_mb():
+    """
+    Возвращает пиковый объем резидентной памяти процесса в мегабайтах.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux сообщает килобайты, macOS — байты
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def benchmark(analyzer, name, text, repeat=1):
+    """
+    Замеряет производительность анализа корпуса, выбирая лучший из repeat прогонов.
+    Перед каждым прогоном кэши морфологии и определений очищаются, чтобы прогоны
+    были сравнимы между собой; время всех прогонов сохраняется в runs_seconds.
+
+    Returns:
+        dict: Машиночитаемый отчет по корпусу.
+    """
+    best = None
+    runs = []
+    for _ in range(repeat):
+        analyzer.morph.clear_cache()
+        analyzer.semantic_analyzer.resolve_definition.cache_clear()
+        _, metrics = analyzer.analyze_with_metrics(text)
+        runs.append(metrics.total_seconds)
+        if best is None or metrics.total_seconds < best.total_seconds:
+            best = metrics
+    report = best.to_dict()
+    return {
+        'corpus': name,
+        'characters': len(text),
+        'tokens': best.counters.get('tokens', 0),
+        'sentences': best.counters.get('sentences', 0),
+        'seconds': best.total_seconds,
+        'runs_seconds': runs,
+        'tokens_per_sec': report['tokens_per_sec'],
+        'sentences_per_sec': report['sentences_per_sec'],
+        'stages': report['stages'],
+        'counters': report['counters'],
+        'morph_cache_hit_rate': report['morph_cache_hit_rate'],
+        'definition_cache_hit_rate': report['definition_cache_hit_rate'],
+        'memory_peak_bytes': report['memory_peak_bytes'],
+        'profile': report['profile'],
+        'peak_rss_mb': peak_rss_mb(),
+        'morph_cache': analyzer.morph.cache_info()
+    }
+
+
+def main():
+    """
+    Запускает набор замеров и выводит отчет в JSON.
+    """
+    parser = argparse.ArgumentParser(description="Замеры производительности конвейера анализа")
+    parser.add_argument("--sample", default="text.rtf", help="RTF-файл для образцового корпуса")
+    parser.add_argument("--scale", type=int, default=20, help="Во сколько раз повторить образец")
+    parser.add_argument("--synthetic", type=int, default=500, help="Количество синтетических предложений")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество прогонов каждого корпуса")
+    parser.add_argument("--definition-index", default=None, help="Индекс определений RuWordNet")
+    parser.add_argument("--profile", action="store_true", help="Добавить в отчет профиль cProfile")
+    parser.add_argument("--trace-memory", action="store_true", help="Замерять пик памяти через tracemalloc")
+    parser.add_argument("--syntax-batch", type=int, default=None,
+                        help="Предложений в пачке синтаксического анализа")
+    parser.add_argument("-o", "--output", default=None, help="Файл для JSON-отчета")
+    args = parser.parse_args()
+
+    from text_analyzer import TextAnalyzer, SYNTAX_BATCH_SIZE
+    start = time.perf_counter()
+    analyzer = TextAnalyzer(definition_index=args.definition_index, profile=args.profile,
+                            trace_memory=args.trace_memory,
+                            syntax_batch_size=args.syntax_batch or SYNTAX_BATCH_SIZE)
+    load_seconds = time.perf_counter() - start
+
+    corpora = []
+    if args.sample:
+        corpora.append((f"sample x{args.scale}", sample_corpus(args.sample, args.scale)))
+    if args.synthetic:
+        corpora.append((f"synthetic {args.synthetic}", synthetic_corpus(args.synthetic)))
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'packages': package_versions(),
+        'model_load_seconds': load_seconds,
+        'syntax_batch_size': analyzer.syntax_parser.batch_size,
+        'results': [benchmark(analyzer, name, text, args.repeat) for name, text in corpora]
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
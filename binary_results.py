@@ -0,0 +1,167 @@
+import mmap
+import struct
+from array import array
+from functools import lru_cache
+from data_structures import SyntaxTree
+
+MAGIC = b'EYZRES01'
+HEADER = struct.Struct('<8sQQQQ')
+NODE_COUNT = struct.Struct('<I')
+NONE_ID = 0xFFFFFFFF
+FIELDS_PER_NODE = 8
+STRING_CACHE_SIZE = 65536
+
+
+def write_results(results, file_path):
+    """
+    Записывает деревья в бинарный файл с таблицей строк и индексом предложений.
+
+    Формат: заголовок (сигнатура, число предложений, число строк, смещение таблицы строк,
+    смещение индекса), затем записи предложений (число узлов и по 8 номеров строк на узел:
+    id, text, pos, head_id, rel, lemma, semantic_role, word_meaning), таблица строк
+    (смещения и UTF-8 данные) и индекс смещений предложений. Деревья записываются
+    по мере поступления, поэтому results может быть потоком.
+
+    Args:
+        results (iterable): Объекты SyntaxTree.
+        file_path (str): Путь к файлу.
+
+    Returns:
+        int: Количество записанных предложений.
+    """
+    string_ids = {}
+    strings = []
+    offsets = array('Q')
+
+    def string_id(value):
+        if value is None:
+            return NONE_ID
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = len(strings)
+            string_ids[value] = sid
+            strings.append(value)
+        return sid
+
+    with open(file_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 0, 0, 0, 0))
+        for tree in results:
+            offsets.append(f.tell())
+            node_ids = tree.node_ids()
+            record = array('I')
+            for node_id in node_ids:
+                node = tree.get_node(node_id)
+                record.extend((
+                    string_id(node_id), string_id(node['text']), string_id(node['pos']),
+                    string_id(node['head_id']), string_id(node['rel']), string_id(node.get('lemma')),
+                    string_id(node.get('semantic_role')), string_id(node.get('word_meaning'))
+                ))
+            f.write(NODE_COUNT.pack(len(node_ids)))
+            f.write(record.tobytes())
+
+        strings_offset = f.tell()
+        encoded = [value.encode('utf-8') for value in strings]
+        string_offsets = array('Q', [0])
+        for data in encoded:
+            string_offsets.append(string_offsets[-1] + len(data))
+        f.write(string_offsets.tobytes())
+        for data in encoded:
+            f.write(data)
+
+        index_offset = f.tell()
+        f.write(offsets.tobytes())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(offsets), len(strings), strings_offset, index_offset))
+    return len(offsets)
+
+
+class BinaryResultReader:
+    """
+    Чтение бинарного файла результатов через mmap с произвольным доступом к предложениям.
+    """
+    def __init__(self, file_path, tree_class=SyntaxTree):
+        """
+        Открывает файл и читает заголовок; предложения и строки декодируются по запросу.
+
+        Args:
+            file_path (str): Путь к файлу.
+            tree_class (type): Класс создаваемых деревьев.
+
+        Raises:
+            ValueError: Если файл не является бинарным файлом результатов.
+        """
+        self.tree_class = tree_class
+        self._file = open(file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Файл результатов пуст")
+        if len(self._map) < HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("Файл не является бинарным файлом результатов")
+        _, self._count, self._string_count, strings_offset, index_offset = HEADER.unpack_from(self._map)
+        self._index = array('Q', self._map[index_offset:index_offset + 8 * self._count])
+        self._string_offsets = array('Q', self._map[strings_offset:strings_offset + 8 * (self._string_count + 1)])
+        self._strings_data = strings_offset + 8 * (self._string_count + 1)
+        self._string = lru_cache(maxsize=STRING_CACHE_SIZE)(self._decode_string)
+
+    def _decode_string(self, sid):
+        if sid == NONE_ID:
+            return None
+        start = self._strings_data + self._string_offsets[sid]
+        stop = self._strings_data + self._string_offsets[sid + 1]
+        return self._map[start:stop].decode('utf-8')
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """
+        Декодирует только предложение с номером index.
+
+        Args:
+            index (int): Номер предложения (с нуля, допускаются отрицательные).
+
+        Returns:
+            SyntaxTree: Дерево предложения.
+        """
+        if index < 0:
+            index += self._count
+        if not (0 <= index < self._count):
+            raise IndexError("Некорректный индекс предложения")
+        offset = self._index[index]
+        (node_count,) = NODE_COUNT.unpack_from(self._map, offset)
+        start = offset + NODE_COUNT.size
+        ids = array('I', self._map[start:start + 4 * FIELDS_PER_NODE * node_count])
+        string = self._string
+        tree = self.tree_class()
+        for i in range(0, len(ids), FIELDS_PER_NODE):
+            tree.add_node(
+                node_id=string(ids[i]),
+                text=string(ids[i + 1]),
+                pos=string(ids[i + 2]),
+                head_id=string(ids[i + 3]),
+                rel=string(ids[i + 4]),
+                lemma=string(ids[i + 5]),
+                semantic_role=string(ids[i + 6]),
+                word_meaning=string(ids[i + 7])
+            )
+        return tree
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self):
+        """
+        Освобождает отображение файла в память.
+        """
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
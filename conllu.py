@@ -0,0 +1,191 @@
+from data_structures import SyntaxTree
+from pos_rel_translations import UNKNOWN, POS_MAP, REL_MAP, REL_LABELS
+
+WRITE_BUFFER = 1 << 16
+
+# Универсальные части речи (UPOS) для читаемых названий; XPOS — исходный тег pymorphy2
+UPOS_OF_POS = {
+    'существительное': 'NOUN',
+    'глагол': 'VERB',
+    'прилагательное': 'ADJ',
+    'наречие': 'ADV',
+    'местоимение': 'PRON',
+    'предлог': 'ADP',
+    'союз': 'CCONJ',
+    'частица': 'PART',
+    'числительное': 'NUM',
+    'деепричастие': 'VERB',
+    'пунктуация': 'PUNCT',
+    UNKNOWN: 'X'
+}
+POS_OF_UPOS = {upos: label for label, upos in reversed(list(UPOS_OF_POS.items()))}
+XPOS_OF_POS = {label: tag for tag, label in POS_MAP.items() if tag is not None}
+DEPREL_OF_REL = {label: tag for tag, label in REL_MAP.items()}
+UNKNOWN_DEPREL = 'dep'
+
+MISC_ESCAPES = {char: f"%{ord(char):02X}" for char in '%|= \t\r\n'}
+
+
+def _escape(value):
+    return ''.join(MISC_ESCAPES.get(char, char) for char in value)
+
+
+def _unescape(value):
+    if '%' not in value:
+        return value
+    from urllib.parse import unquote
+    return unquote(value)
+
+
+def _field(value):
+    return value if value else '_'
+
+
+def _token_number(node_id):
+    return node_id.rpartition('_')[2] if node_id else '_'
+
+
+def format_sentence(tree, sentence_number=None):
+    """
+    Форматирует дерево предложения в блок CoNLL-U.
+
+    Части речи записываются в UPOS (универсальный тег) и XPOS (тег pymorphy2), связи — в DEPREL.
+    Семантическая роль и значение слова, а также названия, для которых нет стандартного
+    тега, записываются в MISC (SemanticRole, Meaning, Pos, Rel) с процентным кодированием.
+
+    Args:
+        tree: Дерево предложения.
+        sentence_number (int, optional): Номер предложения для комментария sent_id;
+            по умолчанию берется из идентификаторов узлов.
+
+    Returns:
+        str: Блок предложения, оканчивающийся пустой строкой.
+    """
+    nodes = tree.to_dict()
+    if sentence_number is None and nodes:
+        sentence_number = next(iter(nodes)).partition('_')[0]
+    lines = [f"# sent_id = {sentence_number}",
+             f"# text = {' '.join(node['text'] for node in nodes.values())}"]
+    for node_id, node in nodes.items():
+        pos = node.get('pos') or UNKNOWN
+        rel = node.get('rel') or UNKNOWN
+        misc = []
+        if pos not in UPOS_OF_POS:
+            misc.append(f"Pos={_escape(pos)}")
+        if rel not in REL_LABELS:
+            misc.append(f"Rel={_escape(rel)}")
+        if node.get('semantic_role'):
+            misc.append(f"SemanticRole={_escape(node['semantic_role'])}")
+        if node.get('word_meaning'):
+            misc.append(f"Meaning={_escape(node['word_meaning'])}")
+        lines.append('\t'.join((
+            _token_number(node_id),
+            _field(node['text']),
+            _field(node.get('lemma')),
+            UPOS_OF_POS.get(pos, 'X'),
+            XPOS_OF_POS.get(pos, '_'),
+            '_',
+            _token_number(node.get('head_id')),
+            DEPREL_OF_REL.get(rel, UNKNOWN_DEPREL),
+            '_',
+            '|'.join(misc) or '_'
+        )))
+    return '\n'.join(lines) + '\n\n'
+
+
+def write_conllu(results, file_path):
+    """
+    Записывает деревья в файл CoNLL-U по одному предложению с буферизацией.
+    Деревья записываются по мере поступления, поэтому results может быть потоком.
+
+    Args:
+        results (iterable): Объекты SyntaxTree.
+        file_path (str): Путь к файлу.
+
+    Returns:
+        int: Количество записанных предложений.
+    """
+    count = 0
+    with open(file_path, 'w', encoding='utf-8', newline='\n', buffering=WRITE_BUFFER) as f:
+        for tree in results:
+            f.write(format_sentence(tree))
+            count += 1
+    return count
+
+
+def _parse_misc(value):
+    misc = {}
+    if value == '_':
+        return misc
+    for item in value.split('|'):
+        name, _, item_value = item.partition('=')
+        misc[name] = _unescape(item_value)
+    return misc
+
+
+def _sentence_tree(sent_id, rows, tree_class):
+    tree = tree_class()
+    for columns in rows:
+        token, form, lemma, upos, xpos, _, head, deprel, _, misc = columns
+        misc = _parse_misc(misc)
+        if 'Pos' in misc:
+            pos = misc['Pos']
+        elif xpos in POS_MAP:
+            pos = POS_MAP[xpos]
+        else:
+            pos = POS_OF_UPOS.get(upos, UNKNOWN)
+        tree.add_node(
+            node_id=f"{sent_id}_{token}",
+            text=form,
+            pos=pos,
+            head_id=f"{sent_id}_{head}" if head != '_' else None,
+            rel=misc.get('Rel') or REL_MAP.get(deprel, UNKNOWN),
+            lemma=lemma if lemma != '_' else None,
+            semantic_role=misc.get('SemanticRole'),
+            word_meaning=misc.get('Meaning')
+        )
+    return tree
+
+
+def iter_conllu(file_path, tree_class=SyntaxTree):
+    """
+    Потоково читает файл CoNLL-U, выдавая по одному дереву (память не зависит от размера файла).
+    Многословные токены (1-2) и пустые узлы (1.1) пропускаются.
+
+    Args:
+        file_path (str): Путь к файлу.
+        tree_class (type): Класс создаваемых деревьев.
+
+    Yields:
+        SyntaxTree: Дерево очередного предложения.
+
+    Raises:
+        ValueError: Если строка токена содержит не 10 столбцов.
+    """
+    sentence_count = 0
+    sent_id = None
+    rows = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line:
+                if rows:
+                    sentence_count += 1
+                    yield _sentence_tree(sent_id or sentence_count, rows, tree_class)
+                sent_id = None
+                rows = []
+                continue
+            if line.startswith('#'):
+                name, separator, value = line[1:].partition('=')
+                if separator and name.strip() == 'sent_id':
+                    sent_id = value.strip()
+                continue
+            columns = line.split('\t')
+            if len(columns) != 10:
+                raise ValueError(f"Строка {line_number}: ожидалось 10 столбцов, получено {len(columns)}")
+            if '-' in columns[0] or '.' in columns[0]:
+                continue
+            rows.append(columns)
+    if rows:
+        sentence_count += 1
+        yield _sentence_tree(sent_id or sentence_count, rows, tree_class)
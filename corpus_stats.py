@@ -0,0 +1,152 @@
+import json
+from collections import Counter
+
+COUNTED_FIELDS = ('lemma', 'pos', 'rel', 'semantic_role')
+FIELD_TITLES = {
+    'lemma': "Леммы",
+    'pos': "Части речи",
+    'rel': "Члены предложения",
+    'semantic_role': "Семантические роли"
+}
+
+
+class CorpusStatistics:
+    """
+    Сводные счетчики по результатам анализа: частоты лемм, распределения частей речи,
+    синтаксических связей и семантических ролей. Обновляются по мере анализа, загрузки
+    и редактирования предложений; счетчики разных процессов объединяются через merge.
+    """
+    def __init__(self):
+        self.sentences = 0
+        self.tokens = 0
+        self.counters = {field: Counter() for field in COUNTED_FIELDS}
+
+    def add_tree(self, tree):
+        """
+        Учитывает дерево предложения.
+        """
+        self.sentences += 1
+        for node in tree.to_dict().values():
+            self.tokens += 1
+            for field, counter in self.counters.items():
+                value = node.get(field)
+                if value is not None:
+                    counter[value] += 1
+
+    def remove_tree(self, tree):
+        """
+        Исключает ранее учтенное дерево предложения.
+        """
+        self.sentences -= 1
+        for node in tree.to_dict().values():
+            self.tokens -= 1
+            for field, counter in self.counters.items():
+                self._decrement(counter, node.get(field))
+
+    @staticmethod
+    def _decrement(counter, value):
+        if value is None:
+            return
+        counter[value] -= 1
+        if counter[value] <= 0:
+            del counter[value]
+
+    def update_fields(self, changes):
+        """
+        Учитывает правку узла.
+
+        Args:
+            changes (dict): Поле → (старое значение, новое значение).
+        """
+        for field, (old, new) in changes.items():
+            counter = self.counters.get(field)
+            if counter is None or old == new:
+                continue
+            self._decrement(counter, old)
+            if new is not None:
+                counter[new] += 1
+
+    def merge(self, other):
+        """
+        Добавляет счетчики другой статистики (например, из другого процесса).
+
+        Returns:
+            CorpusStatistics: self.
+        """
+        self.sentences += other.sentences
+        self.tokens += other.tokens
+        for field, counter in self.counters.items():
+            counter.update(other.counters[field])
+        return self
+
+    __iadd__ = merge
+
+    def clear(self):
+        """
+        Обнуляет счетчики.
+        """
+        self.sentences = 0
+        self.tokens = 0
+        for counter in self.counters.values():
+            counter.clear()
+
+    def to_dict(self, top=None):
+        """
+        Возвращает сводку в виде словаря, пригодного для JSON.
+
+        Args:
+            top (int, optional): Сколько самых частых значений оставить для каждого поля
+                (по умолчанию — все).
+
+        Returns:
+            dict: Количество предложений и токенов и для каждого поля — значения
+                с количеством и долей среди токенов.
+        """
+        summary = {'sentences': self.sentences, 'tokens': self.tokens}
+        for field, counter in self.counters.items():
+            summary[field] = [
+                {'value': value, 'count': count, 'share': count / self.tokens if self.tokens else 0.0}
+                for value, count in counter.most_common(top)
+            ]
+        return summary
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Восстанавливает статистику из полной сводки to_dict().
+        """
+        stats = cls()
+        stats.sentences = data['sentences']
+        stats.tokens = data['tokens']
+        for field, counter in stats.counters.items():
+            counter.update({item['value']: item['count'] for item in data.get(field, ())})
+        return stats
+
+    def save(self, file_path, top=None):
+        """
+        Сохраняет сводку в JSON-файл.
+        """
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(top), f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            raise Exception(f"Ошибка при сохранении статистики: {str(e)}")
+
+    def format_summary(self, top=20):
+        """
+        Форматирует сводку в текст для отчета.
+
+        Args:
+            top (int): Сколько самых частых значений показать для каждого поля.
+
+        Returns:
+            str: Текст сводки.
+        """
+        lines = [f"Предложений: {self.sentences}", f"Токенов: {self.tokens}"]
+        summary = self.to_dict(top)
+        for field in COUNTED_FIELDS:
+            lines.append("")
+            lines.append(f"{FIELD_TITLES[field]} (различных: {len(self.counters[field])}):")
+            for item in summary[field]:
+                lines.append(f"  {item['value']}: {item['count']} ({item['share']:.1%})")
+        return '\n'.join(lines)
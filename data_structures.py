@@ -1,4 +1,7 @@
 import json
+import sys
+import threading
+from array import array
 
 class SyntaxTree:
     """
@@ -34,6 +37,31 @@ class SyntaxTree:
             'word_meaning': word_meaning
         }
 
+    @classmethod
+    def from_dict(cls, tree_data):
+        """
+        Восстанавливает дерево из словаря узлов, полученного через to_dict.
+
+        Args:
+            tree_data (dict): Словарь с узлами дерева.
+
+        Returns:
+            SyntaxTree: Новое дерево.
+        """
+        tree = cls()
+        for node_id, node in tree_data.items():
+            tree.add_node(
+                node_id=node_id,
+                text=node['text'],
+                pos=node['pos'],
+                head_id=node['head_id'],
+                rel=node['rel'],
+                lemma=node.get('lemma'),
+                semantic_role=node.get('semantic_role'),
+                word_meaning=node.get('word_meaning')
+            )
+        return tree
+
     def to_dict(self):
         """
         Возвращает дерево в виде словаря.
@@ -50,4 +78,227 @@ class SyntaxTree:
         Returns:
             str: JSON-представление дерева.
         """
-        return json.dumps(self.nodes, ensure_ascii=False, indent=2)
\ No newline at end of file
+        return json.dumps(self.nodes, ensure_ascii=False, indent=2)
+
+    def get_node(self, node_id):
+        """
+        Возвращает данные узла.
+
+        Args:
+            node_id (str): Идентификатор узла.
+
+        Returns:
+            dict: Поля узла.
+        """
+        return self.nodes[node_id]
+
+    def node_ids(self):
+        """
+        Возвращает идентификаторы узлов в порядке добавления.
+
+        Returns:
+            list: Список идентификаторов.
+        """
+        return list(self.nodes)
+
+    def update_node(self, node_id, **fields):
+        """
+        Изменяет поля существующего узла.
+
+        Args:
+            node_id (str): Идентификатор узла.
+            **fields: Новые значения полей (text, pos, head_id, rel, lemma, semantic_role, word_meaning).
+        """
+        self.nodes[node_id].update(fields)
+
+    def __contains__(self, node_id):
+        return node_id in self.nodes
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class LabelTable:
+    """
+    Таблица кодирования повторяющихся меток (частей речи, связей, ролей) целыми числами.
+    """
+    def __init__(self):
+        self.labels = [None]
+        self.codes = {None: 0}
+        self._lock = threading.Lock()
+
+    def encode(self, label):
+        """
+        Возвращает код метки, добавляя ее в таблицу при первом появлении.
+        """
+        code = self.codes.get(label)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(label)
+                if code is None:
+                    code = len(self.labels)
+                    self.labels.append(label)
+                    self.codes[label] = code
+        return code
+
+    def decode(self, code):
+        """
+        Возвращает метку по коду.
+        """
+        return self.labels[code]
+
+
+POS_LABEL_TABLE = LabelTable()
+REL_LABEL_TABLE = LabelTable()
+ROLE_LABEL_TABLE = LabelTable()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CompactSyntaxTree:
+    """
+    Компактное (столбцовое) представление синтаксического дерева с тем же интерфейсом,
+    что и SyntaxTree. Части речи, связи и роли хранятся кодами общих таблиц меток,
+    остальные строки интернируются, поэтому повторяющиеся значения не дублируются в памяти.
+    """
+    __slots__ = ('_ids', '_index', '_text', '_pos', '_head_id', '_rel', '_lemma', '_role', '_meaning')
+
+    def __init__(self):
+        """
+        Инициализация пустого дерева.
+        """
+        self._ids = []
+        self._index = {}
+        self._text = []
+        self._pos = array('H')
+        self._head_id = []
+        self._rel = array('H')
+        self._lemma = []
+        self._role = array('H')
+        self._meaning = []
+
+    def add_node(self, node_id, text, pos, head_id, rel, lemma=None, semantic_role=None, word_meaning=None):
+        """
+        Добавляет узел в синтаксическое дерево с семантическими данными.
+        Аргументы совпадают с SyntaxTree.add_node.
+        """
+        node_id = _intern(node_id)
+        i = self._index.get(node_id)
+        if i is None:
+            self._index[node_id] = len(self._ids)
+            self._ids.append(node_id)
+            self._text.append(_intern(text))
+            self._pos.append(POS_LABEL_TABLE.encode(pos))
+            self._head_id.append(_intern(head_id))
+            self._rel.append(REL_LABEL_TABLE.encode(rel))
+            self._lemma.append(_intern(lemma))
+            self._role.append(ROLE_LABEL_TABLE.encode(semantic_role))
+            self._meaning.append(_intern(word_meaning))
+        else:
+            self.update_node(node_id, text=text, pos=pos, head_id=head_id, rel=rel, lemma=lemma,
+                             semantic_role=semantic_role, word_meaning=word_meaning)
+
+    def get_node(self, node_id):
+        """
+        Возвращает данные узла.
+
+        Args:
+            node_id (str): Идентификатор узла.
+
+        Returns:
+            dict: Поля узла (новый словарь, его изменение не влияет на дерево).
+        """
+        i = self._index[node_id]
+        return {
+            'text': self._text[i],
+            'pos': POS_LABEL_TABLE.decode(self._pos[i]),
+            'head_id': self._head_id[i],
+            'rel': REL_LABEL_TABLE.decode(self._rel[i]),
+            'lemma': self._lemma[i],
+            'semantic_role': ROLE_LABEL_TABLE.decode(self._role[i]),
+            'word_meaning': self._meaning[i]
+        }
+
+    def node_ids(self):
+        """
+        Возвращает идентификаторы узлов в порядке добавления.
+
+        Returns:
+            list: Список идентификаторов.
+        """
+        return list(self._ids)
+
+    def update_node(self, node_id, **fields):
+        """
+        Изменяет поля существующего узла.
+
+        Args:
+            node_id (str): Идентификатор узла.
+            **fields: Новые значения полей (text, pos, head_id, rel, lemma, semantic_role, word_meaning).
+        """
+        i = self._index[node_id]
+        for field, value in fields.items():
+            if field == 'text':
+                self._text[i] = _intern(value)
+            elif field == 'pos':
+                self._pos[i] = POS_LABEL_TABLE.encode(value)
+            elif field == 'head_id':
+                self._head_id[i] = _intern(value)
+            elif field == 'rel':
+                self._rel[i] = REL_LABEL_TABLE.encode(value)
+            elif field == 'lemma':
+                self._lemma[i] = _intern(value)
+            elif field == 'semantic_role':
+                self._role[i] = ROLE_LABEL_TABLE.encode(value)
+            elif field == 'word_meaning':
+                self._meaning[i] = _intern(value)
+            else:
+                raise KeyError(field)
+
+    @property
+    def nodes(self):
+        """
+        Узлы в виде словаря (строится заново при каждом обращении).
+        """
+        return self.to_dict()
+
+    from_dict = classmethod(SyntaxTree.from_dict.__func__)
+
+    def to_dict(self):
+        """
+        Возвращает дерево в виде словаря.
+
+        Returns:
+            dict: Словарь с узлами дерева.
+        """
+        return {node_id: self.get_node(node_id) for node_id in self._ids}
+
+    def to_json(self):
+        """
+        Сериализует дерево в JSON-строку.
+
+        Returns:
+            str: JSON-представление дерева.
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def __contains__(self, node_id):
+        return node_id in self._index
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getstate__(self):
+        # Коды меток действительны только в текущем процессе, поэтому сериализуются сами метки
+        return (self._ids, self._text, [POS_LABEL_TABLE.decode(code) for code in self._pos], self._head_id,
+                [REL_LABEL_TABLE.decode(code) for code in self._rel], self._lemma,
+                [ROLE_LABEL_TABLE.decode(code) for code in self._role], self._meaning)
+
+    def __setstate__(self, state):
+        self._ids, self._text, pos, self._head_id, rel, self._lemma, role, self._meaning = state
+        self._index = {node_id: i for i, node_id in enumerate(self._ids)}
+        self._pos = array('H', (POS_LABEL_TABLE.encode(label) for label in pos))
+        self._rel = array('H', (REL_LABEL_TABLE.encode(label) for label in rel))
+        self._role = array('H', (ROLE_LABEL_TABLE.encode(label) for label in role))
\ No newline at end of file
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import os
+
+JOURNAL_SUFFIX = '.journal.jsonl'
+STALE_SUFFIX = '.stale'
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def journal_path(results_path):
+    """
+    Возвращает путь журнала правок для файла результатов.
+    """
+    return results_path + JOURNAL_SUFFIX
+
+
+def base_fingerprint(results_path):
+    """
+    Возвращает отпечаток файла результатов, к которому относится журнал.
+
+    Returns:
+        dict: size (байты), mtime (время изменения) и hash (BLAKE2b содержимого).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(results_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    stat = os.stat(results_path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': digest.hexdigest()}
+
+
+class EditJournal:
+    """
+    Журнал правок результатов анализа, который только дополняется.
+
+    Каждая правка узла записывается одной строкой JSON с номером предложения, ID узла
+    и старыми и новыми значениями измененных полей; отмена и повтор записываются
+    как отдельные записи. Поэтому сохранение правки стоит O(1) независимо от размера
+    корпуса, а файл результатов переписывается только при сжатии журнала.
+
+    Первой строкой журнала записывается отпечаток файла результатов ({"op": "base"}),
+    чтобы журнал не применялся к файлу, измененному или замененному после начала правок.
+    Отпечаток вычисляется один раз при создании журнала (то есть при загрузке или сохранении
+    результатов) и переиспользуется для заголовка и проверки.
+    """
+    def __init__(self, path=None, results_path=None):
+        """
+        Args:
+            path (str, optional): Путь к файлу журнала. Если не задан, журнал
+                хранится только в памяти (доступны отмена и повтор).
+            results_path (str, optional): Файл результатов, к которому относятся правки;
+                его отпечаток записывается в начало журнала и проверяется при replay.
+        """
+        self.path = path
+        self.results_path = results_path
+        self.base = None
+        self.rebase()
+        self.records = 0
+        self.applied = 0
+        self._done = []
+        self._undone = []
+        self._file = None
+
+    def _append(self, record):
+        self.records += 1
+        if self.path is None:
+            return
+        if self._file is None:
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if new and self.base is not None:
+                self._file.write(json.dumps({'op': 'base', **self.base}))
+                self._file.write('\n')
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+        self._file.flush()
+
+    @staticmethod
+    def _apply(results, edit, side):
+        tree = results[edit['sentence']]
+        tree.update_node(edit['node'], **{change['field']: change[side] for change in edit['changes']})
+
+    def record(self, sentence_index, node_id, changes):
+        """
+        Записывает правку узла.
+
+        Args:
+            sentence_index (int): Номер предложения в результатах.
+            node_id (str): ID узла.
+            changes (dict): Поле → (старое значение, новое значение); неизмененные поля пропускаются.
+
+        Returns:
+            dict: Запись правки или None, если ни одно поле не изменилось.
+        """
+        changes = [{'field': field, 'old': old, 'new': new}
+                   for field, (old, new) in changes.items() if old != new]
+        if not changes:
+            return None
+        edit = {'op': 'edit', 'sentence': sentence_index, 'node': node_id, 'changes': changes}
+        self._append(edit)
+        self._done.append(edit)
+        self._undone.clear()
+        return edit
+
+    @property
+    def can_undo(self):
+        return bool(self._done)
+
+    @property
+    def can_redo(self):
+        return bool(self._undone)
+
+    def undo(self, results):
+        """
+        Отменяет последнюю правку.
+
+        Args:
+            results (list): Деревья, к которым применялись правки.
+
+        Returns:
+            dict: Отмененная запись правки или None, если отменять нечего.
+        """
+        if not self._done:
+            return None
+        edit = self._done.pop()
+        self._apply(results, edit, 'old')
+        self._append({'op': 'undo'})
+        self._undone.append(edit)
+        return edit
+
+    def redo(self, results):
+        """
+        Повторяет последнюю отмененную правку.
+
+        Returns:
+            dict: Повторенная запись правки или None, если повторять нечего.
+        """
+        if not self._undone:
+            return None
+        edit = self._undone.pop()
+        self._apply(results, edit, 'new')
+        self._append({'op': 'redo'})
+        self._done.append(edit)
+        return edit
+
+    def rebase(self):
+        """
+        Запоминает отпечаток текущего содержимого файла результатов
+        (после того как файл перезаписан, например при сжатии журнала).
+        """
+        if self.results_path is not None and os.path.exists(self.results_path):
+            self.base = base_fingerprint(self.results_path)
+        else:
+            self.base = None
+
+    def _read_base(self):
+        """
+        Возвращает отпечаток из заголовка журнала или None, если заголовка нет.
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            line = f.readline()
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) and record.get('op') == 'base' else None
+
+    def matches_base(self):
+        """
+        Проверяет, что журнал относится к содержимому файла результатов, с которым создан
+        журнал (см. rebase). Журналы без заголовка (и журнал без results_path) считаются подходящими.
+
+        Returns:
+            bool: False, если размер или хэш файла результатов отличаются от записанных.
+        """
+        if self.path is None or self.base is None or not os.path.exists(self.path):
+            return True
+        recorded = self._read_base()
+        if recorded is None:
+            return True
+        return recorded.get('size') == self.base['size'] and recorded.get('hash') == self.base['hash']
+
+    def set_aside(self):
+        """
+        Переименовывает журнал, не подходящий к файлу результатов, в <журнал>.stale
+        и начинает новый.
+
+        Returns:
+            str: Новый путь старого журнала или None, если журнала не было.
+        """
+        self.close()
+        if self.path is None or not os.path.exists(self.path):
+            return None
+        stale_path = self.path + STALE_SUFFIX
+        os.replace(self.path, stale_path)
+        self.records = 0
+        self.applied = 0
+        self._done.clear()
+        self._undone.clear()
+        return stale_path
+
+    def replay(self, results):
+        """
+        Применяет к загруженным результатам все записи журнала и восстанавливает
+        историю отмены и повтора. Оборванная последняя строка (например, после сбоя) пропускается.
+
+        Args:
+            results (list): Деревья, загруженные из файла результатов.
+
+        Returns:
+            int: Количество записей, изменивших результаты (отмена без правок и повтор
+                без отмененных правок не считаются); сохраняется в applied.
+
+        Raises:
+            Exception: Если журнал поврежден, не соответствует результатам или записан
+                для другого содержимого файла результатов (см. matches_base).
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return 0
+        try:
+            if not self.matches_base():
+                raise ValueError("файл результатов изменился после начала правок")
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            records = 0
+            applied = 0
+            for line_number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if line_number == len(lines):
+                        break
+                    raise
+                op = record.get('op')
+                if op == 'base':
+                    continue
+                records += 1
+                if op == 'edit':
+                    self._apply(results, record, 'new')
+                    self._done.append(record)
+                    self._undone.clear()
+                elif op == 'undo' and self._done:
+                    edit = self._done.pop()
+                    self._apply(results, edit, 'old')
+                    self._undone.append(edit)
+                elif op == 'redo' and self._undone:
+                    edit = self._undone.pop()
+                    self._apply(results, edit, 'new')
+                    self._done.append(edit)
+                else:
+                    continue
+                applied += 1
+            self.records = records
+            self.applied = applied
+            return applied
+        except Exception as e:
+            raise Exception(f"Ошибка при применении журнала правок: {str(e)}")
+
+    def clear(self):
+        """
+        Очищает журнал и историю правок (после того как результаты сохранены целиком).
+        """
+        self.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self.records = 0
+        self.applied = 0
+        self._done.clear()
+        self._undone.clear()
+
+    def close(self):
+        """
+        Закрывает файл журнала.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
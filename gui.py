@@ -1,13 +1,24 @@
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QTextEdit, QTreeWidget, QTreeWidgetItem, QFileDialog,
-                             QMessageBox, QMenuBar, QDialog, QFormLayout, QLineEdit, QDialogButtonBox)
-from PyQt5.QtCore import Qt
-from rtf_reader import read_rtf_file
+                             QPushButton, QTextEdit, QTreeView, QFileDialog,
+                             QMessageBox, QMenuBar, QDialog, QFormLayout, QLineEdit, QDialogButtonBox,
+                             QProgressBar)
+from PyQt5.QtCore import Qt, QThread, QTimer
+from analysis_worker import AnalysisWorker, ModelLoader
+from readers import iter_paragraphs, is_supported, file_dialog_filter
 from text_analyzer import TextAnalyzer
+from incremental_analyzer import IncrementalAnalyzer
 from result_manager import ResultManager
+from result_model import ResultTreeModel
+from result_index import ResultIndex, parse_query
+from edit_journal import EditJournal, journal_path
+from corpus_stats import CorpusStatistics
 from help_system import show_help
 from pos_rel_translations import translate_pos, translate_rel
 
+AUTO_EXPAND_SENTENCES = 200
+# Сколько символов большого файла показывать в текстовом поле; анализируется весь файл
+PREVIEW_CHARS = 200000
+
 class MainWindow(QMainWindow):
     """
     Основное окно приложения для синтаксического и семантического анализа текста.
@@ -16,11 +27,21 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Синтаксический и семантический анализатор текста")
         self.setGeometry(100, 100, 1200, 600)
-        self.analyzer = TextAnalyzer()
+        self.analyzer = TextAnalyzer(lazy=True)
+        self.incremental_analyzer = IncrementalAnalyzer(self.analyzer)
         self.result_manager = ResultManager()
         self.current_results = []
+        self.result_index = ResultIndex()
+        self.statistics = CorpusStatistics()
+        self.results_path = None
+        self.source_path = None
+        self.journal = EditJournal()
+        self.analysis_thread = None
+        self.analysis_worker = None
+        self.loader_thread = None
         self.init_ui()
         self.setAcceptDrops(True)
+        QTimer.singleShot(0, self.load_models)
 
     def init_ui(self):
         """
@@ -32,39 +53,73 @@ class MainWindow(QMainWindow):
 
         # Меню
         menubar = self.menuBar()
+        file_menu = menubar.addMenu("Файл")
+        open_results_action = file_menu.addAction("Открыть результаты (JSON)")
+        open_results_action.triggered.connect(self.open_results)
+        compact_action = file_menu.addAction("Сжать журнал правок")
+        compact_action.triggered.connect(self.compact_journal)
+        edit_menu = menubar.addMenu("Правка")
+        self.undo_action = undo_action = edit_menu.addAction("Отменить правку")
+        undo_action.setShortcut("Ctrl+Z")
+        undo_action.triggered.connect(self.undo_edit)
+        self.redo_action = redo_action = edit_menu.addAction("Повторить правку")
+        redo_action.setShortcut("Ctrl+Y")
+        redo_action.triggered.connect(self.redo_edit)
+        stats_menu = menubar.addMenu("Статистика")
+        stats_action = stats_menu.addAction("Сводка по результатам")
+        stats_action.triggered.connect(self.show_statistics)
         help_menu = menubar.addMenu("Справка")
         help_action = help_menu.addAction("Открыть справку")
         help_action.triggered.connect(show_help)
 
         # Панель кнопок
         button_layout = QHBoxLayout()
-        load_btn = QPushButton("Загрузить RTF")
+        load_btn = QPushButton("Загрузить файл")
         load_btn.clicked.connect(self.load_file)
         analyze_btn = QPushButton("Анализировать")
         analyze_btn.clicked.connect(self.analyze_text)
+        self.analyze_btn = analyze_btn
+        self.cancel_btn = QPushButton("Отменить анализ")
+        self.cancel_btn.clicked.connect(self.cancel_analysis)
+        self.cancel_btn.setEnabled(False)
         save_btn = QPushButton("Сохранить результаты (JSON)")
         save_btn.clicked.connect(self.save_results)
         doc_btn = QPushButton("Документировать (TXT)")
         doc_btn.clicked.connect(self.document_results)
-        for btn in [load_btn, analyze_btn, save_btn, doc_btn]:
+        for btn in [load_btn, analyze_btn, self.cancel_btn, save_btn, doc_btn]:
             btn.setStyleSheet("QPushButton { padding: 5px; font-size: 14px; }")
             button_layout.addWidget(btn)
         main_layout.addLayout(button_layout)
 
+        # Индикатор прогресса анализа
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("Предложения: %v из %m")
+        self.progress_bar.setVisible(False)
+        main_layout.addWidget(self.progress_bar)
+
         # Текстовое поле для исходного текста
         self.text_edit = QTextEdit()
-        self.text_edit.setPlaceholderText("Загрузите RTF-файл или введите текст для анализа")
+        self.text_edit.setPlaceholderText("Загрузите файл (RTF, TXT, GZ, JSONL) или введите текст для анализа")
         self.text_edit.setStyleSheet("QTextEdit { font-size: 14px; padding: 10px; }")
+        self.text_edit.textChanged.connect(self.on_text_changed)
         main_layout.addWidget(self.text_edit)
 
-        # Дерево для отображения результатов анализа
-        self.tree_widget = QTreeWidget()
-        self.tree_widget.setHeaderLabels([
-            "Идентификатор", "Слово", "Часть речи", "Член предложения", 
-            "К какому слову относится", "Лемма", "Семантическая роль", 
-            "Значение слова"
-        ])
-        self.tree_widget.setStyleSheet("QTreeWidget { font-size: 14px; }")
+        # Фильтр результатов по индексу
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText(
+            "Фильтр: lemma=книга pos=существительное rel=дополнение head_lemma=читать "
+            "(поля: lemma, pos, rel, semantic_role, head_lemma, head_pos, head_rel)"
+        )
+        self.filter_edit.setStyleSheet("QLineEdit { font-size: 14px; padding: 5px; }")
+        self.filter_edit.returnPressed.connect(self.apply_filter)
+        main_layout.addWidget(self.filter_edit)
+
+        # Дерево для отображения результатов анализа (модель подгружает строки по мере раскрытия)
+        self.result_model = ResultTreeModel(self)
+        self.tree_widget = QTreeView()
+        self.tree_widget.setModel(self.result_model)
+        self.tree_widget.setUniformRowHeights(True)
+        self.tree_widget.setStyleSheet("QTreeView { font-size: 14px; }")
         self.tree_widget.setColumnWidth(0, 50)
         self.tree_widget.setColumnWidth(1, 100)
         self.tree_widget.setColumnWidth(2, 100)
@@ -73,9 +128,39 @@ class MainWindow(QMainWindow):
         self.tree_widget.setColumnWidth(5, 100)
         self.tree_widget.setColumnWidth(6, 120)
         self.tree_widget.setColumnWidth(7, 150)
-        self.tree_widget.itemDoubleClicked.connect(self.edit_node)
+        self.tree_widget.doubleClicked.connect(self.edit_node)
         main_layout.addWidget(self.tree_widget)
 
+        # Сочетания отмены и повтора правок действуют только в дереве результатов,
+        # чтобы не перехватывать отмену ввода в текстовом поле
+        for action in (self.undo_action, self.redo_action):
+            action.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+            self.tree_widget.addAction(action)
+
+        # Индикатор готовности моделей
+        self.statusBar().showMessage("Загрузка моделей...")
+
+    def load_models(self):
+        """
+        Загружает модели анализатора в фоновом потоке, не задерживая показ окна.
+        """
+        self.loader_thread = QThread(self)
+        self.model_loader = ModelLoader(self.analyzer)
+        self.model_loader.moveToThread(self.loader_thread)
+        self.loader_thread.started.connect(self.model_loader.run)
+        self.model_loader.loaded.connect(self.on_models_loaded)
+        self.model_loader.failed.connect(self.on_models_failed)
+        self.model_loader.loaded.connect(self.loader_thread.quit)
+        self.model_loader.failed.connect(self.loader_thread.quit)
+        self.loader_thread.start()
+
+    def on_models_loaded(self):
+        self.statusBar().showMessage("Модели загружены")
+
+    def on_models_failed(self, message):
+        self.statusBar().showMessage("Ошибка загрузки моделей")
+        QMessageBox.critical(self, "Ошибка", message)
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             event.accept()
@@ -83,65 +168,291 @@ class MainWindow(QMainWindow):
             event.ignore()
 
     def dropEvent(self, event):
+        if self.analysis_thread is not None:
+            self.warn_analysis_running()
+            event.ignore()
+            return
         for url in event.mimeData().urls():
             file_path = url.toLocalFile()
-            if file_path.lower().endswith('.rtf'):
+            if is_supported(file_path):
                 self.load_file(file_path)
                 event.accept()
                 return
-        QMessageBox.warning(self, "Ошибка", "Перетаскивайте только RTF-файлы")
+        QMessageBox.warning(self, "Ошибка", "Формат перетаскиваемого файла не поддерживается")
 
     def load_file(self, file_path=None):
+        """
+        Загружает файл потоково. Если файл длиннее PREVIEW_CHARS, в текстовом поле показывается
+        его начало, а анализ читает весь файл по абзацам, пока текст в поле не изменен.
+        """
+        # Новый файл сбрасывает результаты, в которые еще пишет работающий анализ
+        if self.analysis_thread is not None:
+            self.warn_analysis_running()
+            return
         if not file_path:
-            file_path, _ = QFileDialog.getOpenFileName(self, "Выберите RTF-файл", "", "RTF Files (*.rtf)")
+            file_path, _ = QFileDialog.getOpenFileName(self, "Выберите файл", "", file_dialog_filter())
         if file_path:
             try:
-                text = read_rtf_file(file_path)
-                self.text_edit.setText(text)
-                self.tree_widget.clear()
-                self.current_results = []
+                preview, complete = self.read_preview(file_path)
+                if not preview.strip():
+                    raise Exception("Ошибка при чтении файла: файл пуст или содержит некорректные данные")
+                self.text_edit.setPlainText(preview)
+                self.source_path = None if complete else file_path
+                self.display_results([])
+                self.results_path = None
+                if not complete:
+                    self.statusBar().showMessage(
+                        f"Показано начало файла ({len(preview)} символов); анализируется весь файл")
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", str(e))
 
+    def warn_analysis_running(self):
+        QMessageBox.warning(self, "Предупреждение", "Дождитесь окончания анализа или отмените его")
+
+    @staticmethod
+    def read_preview(file_path):
+        """
+        Читает начало файла по абзацам, не больше PREVIEW_CHARS символов.
+
+        Returns:
+            tuple: (текст, прочитан ли файл целиком).
+        """
+        paragraphs = iter_paragraphs(file_path)
+        parts = []
+        size = 0
+        try:
+            for paragraph in paragraphs:
+                if size + len(paragraph) > PREVIEW_CHARS:
+                    parts.append(paragraph[:PREVIEW_CHARS - size])
+                    return '\n'.join(parts), False
+                parts.append(paragraph)
+                size += len(paragraph) + 1
+            return '\n'.join(parts), True
+        finally:
+            paragraphs.close()
+
+    def on_text_changed(self):
+        # После правки текста анализируется содержимое поля, а не файл
+        self.source_path = None
+
     def analyze_text(self):
         text = self.text_edit.toPlainText()
         if not text:
             QMessageBox.warning(self, "Предупреждение", "Загрузите или введите текст для анализа")
             return
+        if self.analysis_thread is not None:
+            return
+        self.display_results([])
+        self.results_path = None
+
+        self.analysis_thread = QThread(self)
+        if self.source_path is not None:
+            self.analysis_worker = AnalysisWorker(self.incremental_analyzer,
+                                                  paragraphs=iter_paragraphs(self.source_path))
+        else:
+            self.analysis_worker = AnalysisWorker(self.incremental_analyzer, text)
+        self.analysis_worker.moveToThread(self.analysis_thread)
+        self.analysis_thread.started.connect(self.analysis_worker.run)
+        self.analysis_worker.sentence_ready.connect(self.on_sentence_ready)
+        self.analysis_worker.progress.connect(self.on_analysis_progress)
+        self.analysis_worker.failed.connect(self.on_analysis_failed)
+        for signal in (self.analysis_worker.finished, self.analysis_worker.cancelled,
+                       self.analysis_worker.failed):
+            signal.connect(self.analysis_thread.quit)
+        self.analysis_thread.finished.connect(self.on_analysis_stopped)
+
+        self.analyze_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.analysis_thread.start()
+
+    def cancel_analysis(self):
+        if self.analysis_worker is not None:
+            self.analysis_worker.cancel()
+            self.cancel_btn.setEnabled(False)
+
+    def on_sentence_ready(self, i, tree):
+        self.result_model.append_tree(tree)
+        self.result_index.add_tree(i, tree)
+        self.statistics.add_tree(tree)
+        if i < AUTO_EXPAND_SENTENCES:
+            row = self.result_model.sentence_row(i)
+            if row is not None:
+                self.tree_widget.expand(self.result_model.index(row, 0))
+
+    def on_analysis_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        if not total and done:
+            self.statusBar().showMessage(f"Проанализировано предложений: {done}")
+
+    def on_analysis_failed(self, message):
+        QMessageBox.critical(self, "Ошибка", f"Ошибка анализа: {message}")
+
+    def on_analysis_stopped(self):
+        self.analysis_worker.deleteLater()
+        self.analysis_thread.deleteLater()
+        self.analysis_worker = None
+        self.analysis_thread = None
+        self.analyze_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        if self.filter_edit.text().strip():
+            self.apply_filter()
+
+    def closeEvent(self, event):
+        if self.analysis_thread is not None:
+            self.analysis_worker.cancel()
+            self.analysis_thread.quit()
+            self.analysis_thread.wait()
+        if self.loader_thread is not None:
+            self.loader_thread.wait()
+        self.journal.close()
+        super().closeEvent(event)
+
+    def display_results(self, results, journal=None):
+        self.current_results = results
+        self.journal.close()
+        self.journal = journal or EditJournal()
+        self.result_index.clear()
+        self.statistics.clear()
+        for i, tree in enumerate(results):
+            self.result_index.add_tree(i, tree)
+            self.statistics.add_tree(tree)
+        self.result_model.set_results(results)
+        if self.filter_edit.text().strip():
+            # Поле фильтра по-прежнему показывает запрос, поэтому фильтр применяется к новым результатам
+            self.apply_filter()
+        else:
+            self.expand_first_sentences()
+
+    def expand_first_sentences(self):
+        for row in range(min(self.result_model.rowCount(), AUTO_EXPAND_SENTENCES)):
+            self.tree_widget.expand(self.result_model.index(row, 0))
+
+    def apply_filter(self):
+        """
+        Показывает только узлы, найденные по запросу из поля фильтра; пустой запрос снимает фильтр.
+        """
+        query = self.filter_edit.text().strip()
+        try:
+            if not query:
+                self.result_model.set_filter(None)
+            else:
+                matches = self.result_index.query(**parse_query(query))
+                self.result_model.set_filter(self.result_index.group_by_sentence(matches))
+                self.statusBar().showMessage(f"Найдено узлов: {len(matches)}")
+            self.expand_first_sentences()
+        except Exception as e:
+            QMessageBox.warning(self, "Ошибка", f"Некорректный запрос: {str(e)}")
+
+    def open_results(self):
+        """
+        Открывает сохраненные результаты и применяет к ним журнал правок, если он есть.
+        """
+        if self.analysis_thread is not None:
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, "Открыть результаты", "", "JSON Files (*.json)")
+        if not file_path:
+            return
         try:
-            self.current_results = self.analyzer.analyze(text)
-            self.display_results(self.current_results)
+            journal = EditJournal(journal_path(file_path), results_path=file_path)
+            if not journal.matches_base():
+                stale_path = journal.set_aside()
+                QMessageBox.warning(self, "Предупреждение",
+                                    "Файл результатов изменился после начала правок, поэтому журнал "
+                                    f"правок не применен. Он сохранен как {stale_path}")
+            results = self.result_manager.load_results(file_path, journal=journal)
+            self.display_results(results, journal)
+            self.results_path = file_path
+            self.statusBar().showMessage(f"Загружено предложений: {len(results)}, "
+                                         f"применено записей журнала: {journal.applied}")
         except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка анализа: {str(e)}")
+            QMessageBox.critical(self, "Ошибка", str(e))
 
-    def display_results(self, results):
-        self.tree_widget.clear()
-        for i, tree in enumerate(results):
-            root = QTreeWidgetItem(self.tree_widget, [f"Предложение {i+1}", "", "", "", "", "", "", ""])
-            for node_id, node in tree.to_dict().items():
-                item = QTreeWidgetItem(root, [
-                    node_id,
-                    node['text'],
-                    node['pos'],
-                    node['rel'],
-                    node['head_id'],
-                    node.get('lemma', ''),
-                    node.get('semantic_role', ''),
-                    node.get('word_meaning', '')
-                ])
-                item.setData(0, Qt.UserRole, (i, node_id))
-            root.setExpanded(True)
-
-    def edit_node(self, item, column):
-        if item.text(0).startswith("Предложение"):
+    def compact_journal(self):
+        """
+        Переписывает файл результатов с учетом правок и очищает журнал.
+        """
+        if self.results_path is None:
+            QMessageBox.warning(self, "Предупреждение", "Сначала сохраните результаты в JSON")
+            return
+        try:
+            self.result_manager.compact_results(self.current_results, self.results_path, self.journal)
+            self.statusBar().showMessage("Журнал правок сжат")
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", str(e))
+
+    def undo_edit(self):
+        edit = self.journal.undo(self.current_results)
+        self.refresh_edited(edit, {change['field']: (change['new'], change['old'])
+                                   for change in edit['changes']} if edit else None)
+
+    def redo_edit(self):
+        edit = self.journal.redo(self.current_results)
+        self.refresh_edited(edit, {change['field']: (change['old'], change['new'])
+                                   for change in edit['changes']} if edit else None)
+
+    def refresh_edited(self, edit, changes):
+        """
+        Обновляет индекс, статистику и строку представления после отмены или повтора правки.
+        """
+        if edit is None:
+            return
+        self.statistics.update_fields(changes)
+        sentence_index = edit['sentence']
+        self.result_index.update_tree(sentence_index, self.current_results[sentence_index])
+        self.result_model.update_node(sentence_index, edit['node'])
+
+    def show_statistics(self):
+        """
+        Показывает сводную статистику по текущим результатам с возможностью экспорта в JSON.
+        """
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Статистика результатов")
+        dialog.setMinimumSize(500, 500)
+        layout = QVBoxLayout(dialog)
+
+        summary = QTextEdit()
+        summary.setReadOnly(True)
+        summary.setPlainText(self.statistics.format_summary())
+        summary.setStyleSheet("QTextEdit { font-size: 14px; padding: 10px; }")
+        layout.addWidget(summary)
+
+        button_layout = QHBoxLayout()
+        export_btn = QPushButton("Экспорт (JSON)")
+        export_btn.clicked.connect(self.export_statistics)
+        close_btn = QPushButton("Закрыть")
+        close_btn.clicked.connect(dialog.accept)
+        button_layout.addWidget(export_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        dialog.exec_()
+
+    def export_statistics(self):
+        try:
+            file_path, _ = QFileDialog.getSaveFileName(self, "Сохранить статистику", "", "JSON Files (*.json)")
+            if file_path:
+                if not file_path.lower().endswith('.json'):
+                    file_path += '.json'
+                self.statistics.save(file_path)
+                QMessageBox.information(self, "Успех", "Статистика сохранена в JSON")
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка сохранения: {str(e)}")
+
+    def edit_node(self, index):
+        location = self.result_model.sentence_node(index)
+        if location is None:
             return
-        sentence_index, node_id = item.data(0, Qt.UserRole)
-        current_pos = item.text(2)
-        current_rel = item.text(3)
-        current_head_id = item.text(4)
-        current_lemma = item.text(5)
-        current_semantic_role = item.text(6)
-        current_word_meaning = item.text(7)
+        sentence_index, node_id = location
+        node = self.current_results[sentence_index].get_node(node_id)
+        current_pos = node['pos'] or ''
+        current_rel = node['rel'] or ''
+        current_head_id = node['head_id'] or ''
+        current_lemma = node.get('lemma') or ''
+        current_semantic_role = node.get('semantic_role') or ''
+        current_word_meaning = node.get('word_meaning') or ''
 
         dialog = QDialog(self)
         dialog.setWindowTitle("Редактировать узел")
@@ -180,9 +491,10 @@ class MainWindow(QMainWindow):
                     self.current_results, sentence_index, node_id,
                     new_head_id=new_head_id, new_rel=new_rel, new_pos=new_pos,
                     new_lemma=new_lemma, new_semantic_role=new_semantic_role,
-                    new_word_meaning=new_word_meaning
+                    new_word_meaning=new_word_meaning, journal=self.journal, stats=self.statistics
                 )
-                self.display_results(self.current_results)
+                self.result_index.update_tree(sentence_index, self.current_results[sentence_index])
+                self.result_model.update_node(sentence_index, node_id)
                 QMessageBox.information(self, "Успех", "Узел успешно отредактирован")
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Ошибка редактирования: {str(e)}")
@@ -192,11 +504,25 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Предупреждение", "Нет результатов для сохранения")
             return
         try:
-            file_path, _ = QFileDialog.getSaveFileName(self, "Сохранить результаты", "", "JSON Files (*.json)")
+            file_path, selected_filter = QFileDialog.getSaveFileName(
+                self, "Сохранить результаты", "", "JSON Files (*.json);;Binary Files (*.bin);;CoNLL-U Files (*.conllu)")
             if file_path:
+                if file_path.lower().endswith('.conllu') or selected_filter.startswith("CoNLL-U"):
+                    self.result_manager.save_results_conllu(self.current_results, file_path)
+                    QMessageBox.information(self, "Успех", "Результаты сохранены в CoNLL-U")
+                    return
+                if file_path.lower().endswith('.bin') or selected_filter.startswith("Binary"):
+                    self.result_manager.save_results_binary(self.current_results, file_path)
+                    QMessageBox.information(self, "Успех", "Результаты сохранены в бинарный файл")
+                    return
                 if not file_path.lower().endswith('.json'):
                     file_path += '.json'
                 self.result_manager.save_results(self.current_results, file_path)
+                # Сохраненный файл становится основой для журнала правок
+                self.journal.close()
+                self.journal = EditJournal(journal_path(file_path), results_path=file_path)
+                self.journal.clear()
+                self.results_path = file_path
                 QMessageBox.information(self, "Успех", "Результаты сохранены в JSON")
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка сохранения: {str(e)}")
@@ -15,19 +15,20 @@ def show_help():
     help_text.setReadOnly(True)
     help_text.setText("""
     <h2>Справка по использованию программы</h2>
-    <p>Эта программа предназначена для синтаксического и семантического анализа текста на русском языке из RTF-файлов.</p>
+    <p>Эта программа предназначена для синтаксического и семантического анализа текста на русском языке из файлов RTF, TXT, сжатых GZ и корпусов JSONL.</p>
     <h3>Инструкции по использованию:</h3>
     <ul>
-        <li><b>Загрузка файла:</b> Нажмите кнопку "Загрузить RTF" и выберите файл в формате RTF. Текст отобразится в текстовом поле.</li>
+        <li><b>Загрузка файла:</b> Нажмите кнопку "Загрузить файл" и выберите файл (RTF, TXT, GZ или JSONL) или перетащите его в окно. Текст отобразится в текстовом поле.</li>
         <li><b>Анализ текста:</b> Нажмите кнопку "Анализировать" для выполнения анализа. Результаты появятся в виде дерева зависимостей.</li>
         <li><b>Просмотр результатов:</b> Дерево показывает Идентификатор, Слово, Часть речи, Член предложения, К какому слову относится, Лемму, Семантическую роль и Значение слова.</li>
         <li><b>Сохранение результатов:</b> Нажмите "Сохранить результаты" для экспорта в JSON-файл.</li>
-        <li><b>Редактирование:</b> Дважды щелкните по узлу для Редактирования данных.</li>
+        <li><b>Редактирование:</b> Дважды щелкните по узлу для Редактирования данных. Правки сохраненных результатов дописываются в журнал рядом с JSON-файлом (*.journal.jsonl) и применяются при открытии через "Файл → Открыть результаты". Отмена и повтор правки — Ctrl+Z и Ctrl+Y, "Файл → Сжать журнал правок" переписывает JSON-файл с учетом правок.</li>
+        <li><b>Статистика:</b> Меню "Статистика → Сводка по результатам" показывает частоты лемм, частей речи, членов предложения и семантических ролей; сводку можно экспортировать в JSON.</li>
         <li><b>Документирование:</b> Результаты можно экспортировать в текстовый формат через "Документировать".</li>
     </ul>
     <h3>Советы:</h3>
     <ul>
-        <li>Убедитесь, что RTF-файл содержит текст на русском языке.</li>
+        <li>Убедитесь, что файл содержит текст на русском языке.</li>
         <li>При возникновении ошибок программа выдаст сообщение.</li>
         <li>Для больших текстов анализ может занять несколько секунд.</li>
     </ul>
@@ -0,0 +1,179 @@
+import hashlib
+from collections import OrderedDict
+from itertools import islice
+from text_analyzer import shift_node_id
+
+DEFAULT_MAX_SENTENCES = 20000
+
+
+def sentence_key(text):
+    """
+    Возвращает хэш содержимого предложения.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def renumber_tree(tree, sentence_number):
+    """
+    Возвращает копию дерева, в идентификаторах узлов которой стоит номер предложения sentence_number.
+
+    Args:
+        tree: Дерево (SyntaxTree или CompactSyntaxTree).
+        sentence_number (int): Новый номер предложения.
+
+    Returns:
+        Дерево того же класса.
+    """
+    node_ids = tree.node_ids()
+    offset = sentence_number - int(node_ids[0].partition('_')[0]) if node_ids else 0
+    copy = type(tree)()
+    for node_id in node_ids:
+        node = tree.get_node(node_id)
+        copy.add_node(
+            node_id=shift_node_id(node_id, offset),
+            text=node['text'],
+            pos=node['pos'],
+            head_id=shift_node_id(node['head_id'], offset),
+            rel=node['rel'],
+            lemma=node.get('lemma'),
+            semantic_role=node.get('semantic_role'),
+            word_meaning=node.get('word_meaning')
+        )
+    return copy
+
+
+class IncrementalAnalyzer:
+    """
+    Повторный анализ отредактированного текста: разбираются только новые или измененные
+    предложения, для остальных используются деревья из кэша по хэшу содержимого.
+    """
+    def __init__(self, analyzer, max_sentences=DEFAULT_MAX_SENTENCES, persistent_cache=None, batch_size=None):
+        """
+        Args:
+            analyzer (TextAnalyzer): Анализатор текста.
+            max_sentences (int): Сколько разобранных предложений хранить в кэше (LRU).
+            persistent_cache (AnalysisCache, optional): Постоянный кэш на диске, к которому
+                обращаются при промахе кэша в памяти.
+            batch_size (int, optional): Сколько предложений обрабатывать за один проход
+                (по умолчанию — syntax_batch_size анализатора).
+        """
+        self.analyzer = analyzer
+        self.batch_size = batch_size or analyzer.syntax_batch_size
+        self.persistent_cache = persistent_cache
+        self.max_sentences = max_sentences
+        self._cache = OrderedDict()
+        self.reused = 0
+        self.analyzed = 0
+
+    def split_sentences(self, text):
+        """
+        Разбивает текст на предложения (см. TextAnalyzer.split_sentences).
+        """
+        return self.analyzer.split_sentences(text)
+
+    def iter_analyze(self, text):
+        """
+        Анализирует текст, выдавая деревья предложений по порядку.
+
+        Args:
+            text (str): Входной текст для анализа.
+
+        Yields:
+            SyntaxTree: Дерево очередного предложения (копия, ее можно редактировать).
+
+        Raises:
+            Exception: Если входной текст пустой или произошла ошибка при анализе.
+        """
+        if not text or not text.strip():
+            raise Exception("Ошибка при синтаксическом анализе: Входной текст пуст")
+
+        yield from self.iter_analyze_sentences(self.split_sentences(text))
+
+    def iter_analyze_sentences(self, sentences, first_sentence=1):
+        """
+        Анализирует уже выделенные предложения (см. split_sentences) без повторной сегментации текста.
+
+        Предложения обрабатываются окнами по batch_size: отсутствующие в кэше предложения
+        окна разбираются одним вызовом analyze_batch, то есть общими пачками синтаксического анализа.
+
+        Args:
+            sentences (iterable): Подстроки Natasha с полем text.
+            first_sentence (int): Номер первого предложения в идентификаторах узлов.
+
+        Yields:
+            SyntaxTree: Дерево очередного предложения (копия, ее можно редактировать).
+        """
+        number = first_sentence - 1
+        iterator = iter(sentences)
+        while True:
+            window = [sentence.text for sentence in islice(iterator, self.batch_size)]
+            if not window:
+                return
+            for trees in self._lookup(window):
+                for tree in trees:
+                    number += 1
+                    yield renumber_tree(tree, number)
+
+    def _lookup(self, texts):
+        """
+        Возвращает деревья для каждого текста предложения: из кэша в памяти, постоянного
+        кэша или, для остальных, из одного общего вызова analyze_batch.
+        """
+        found = []
+        for text in texts:
+            trees = self._cache.get(sentence_key(text))
+            if trees is None and self.persistent_cache is not None:
+                trees = self.persistent_cache.get(text, self.analyzer.tree_class)
+            found.append(trees)
+        missing = list(dict.fromkeys(text for text, trees in zip(texts, found) if trees is None))
+        analyzed = dict(zip(missing, self.analyzer.analyze_batch(missing))) if missing else {}
+        for text in missing:
+            if self.persistent_cache is not None:
+                self.persistent_cache.put(text, analyzed[text])
+        self.analyzed += len(missing)
+        self.reused += len(texts) - len(missing)
+        results = []
+        for text, trees in zip(texts, found):
+            if trees is None:
+                trees = analyzed[text]
+            key = sentence_key(text)
+            if key not in self._cache:
+                self._cache[key] = trees
+                if len(self._cache) > self.max_sentences:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            results.append(trees)
+        return results
+
+    def iter_analyze_paragraphs(self, paragraphs):
+        """
+        Потоково анализирует текст, поступающий абзацами (см. readers.iter_paragraphs).
+        Нумерация предложений сквозная для всех абзацев; предложения соседних абзацев
+        попадают в общие окна анализа (см. iter_analyze_sentences).
+
+        Args:
+            paragraphs (iterable): Строки абзацев.
+
+        Yields:
+            SyntaxTree: Дерево очередного предложения.
+        """
+        yield from self.iter_analyze_sentences(
+            sentence for paragraph in paragraphs if paragraph.strip()
+            for sentence in self.split_sentences(paragraph)
+        )
+
+    def analyze(self, text):
+        """
+        Анализирует текст, переиспользуя деревья неизмененных предложений.
+
+        Returns:
+            list: Список объектов SyntaxTree для каждого предложения.
+        """
+        return list(self.iter_analyze(text))
+
+    def clear(self):
+        """
+        Очищает кэш предложений.
+        """
+        self._cache.clear()
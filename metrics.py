@@ -0,0 +1,135 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_LIMIT = 30
+
+
+class AnalysisMetrics:
+    """
+    Метрики одного запуска анализа: время этапов, счетчики и, по желанию,
+    профиль cProfile и пиковое потребление памяти по tracemalloc.
+    """
+    def __init__(self, profile=False, trace_memory=False):
+        """
+        Args:
+            profile (bool): Собирать профиль cProfile.
+            trace_memory (bool): Отслеживать выделение памяти через tracemalloc.
+        """
+        self.stages = {}
+        self.counters = {}
+        self.total_seconds = 0.0
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_stats = None
+        self.memory_peak_bytes = None
+        self._profiler = None
+        self._started_at = None
+        self._paused = False
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Контекстный менеджер, добавляющий время блока к этапу name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, value=1):
+        """
+        Увеличивает счетчик name на value.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def start(self):
+        """
+        Начинает замер общего времени и, если включено, профилирование.
+        """
+        self._started_at = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def pause(self):
+        """
+        Приостанавливает замер общего времени и профилирование, например пока
+        потребитель потокового анализа обрабатывает выданное дерево.
+        """
+        if self._started_at is None:
+            return
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.total_seconds += time.perf_counter() - self._started_at
+        self._started_at = None
+        self._paused = True
+
+    def resume(self):
+        """
+        Возобновляет замер, приостановленный pause().
+        """
+        if not self._paused:
+            return
+        self._paused = False
+        self._started_at = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def stop(self):
+        """
+        Завершает замер (в том числе приостановленный) и сохраняет результаты профилирования.
+        """
+        if self._started_at is None and not self._paused:
+            return
+        if self._profiler is not None:
+            self._profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_LIMIT)
+            self.profile_stats = stream.getvalue()
+            self._profiler = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.memory_peak_bytes = tracemalloc.get_traced_memory()[1]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        if self._started_at is not None:
+            self.total_seconds += time.perf_counter() - self._started_at
+        self._started_at = None
+        self._paused = False
+
+    def hit_rate(self, hits_counter, misses_counter):
+        """
+        Возвращает долю попаданий в кэш по паре счетчиков или None, если обращений не было.
+        """
+        hits = self.counters.get(hits_counter, 0)
+        total = hits + self.counters.get(misses_counter, 0)
+        return hits / total if total else None
+
+    def to_dict(self):
+        """
+        Возвращает метрики в виде словаря, пригодного для JSON.
+        """
+        tokens = self.counters.get('tokens', 0)
+        sentences = self.counters.get('sentences', 0)
+        return {
+            'total_seconds': self.total_seconds,
+            'tokens_per_sec': tokens / self.total_seconds if self.total_seconds else None,
+            'sentences_per_sec': sentences / self.total_seconds if self.total_seconds else None,
+            'stages': dict(self.stages),
+            'counters': dict(self.counters),
+            'morph_cache_hit_rate': self.hit_rate('morph_cache_hits', 'morph_cache_misses'),
+            'definition_cache_hit_rate': self.hit_rate('definition_cache_hits', 'wordnet_lookups'),
+            'memory_peak_bytes': self.memory_peak_bytes,
+            'profile': self.profile_stats
+        }
@@ -0,0 +1,112 @@
+from collections import namedtuple
+from functools import lru_cache
+
+DEFAULT_CACHE_SIZE = 100000
+
+_shared_morph = None
+
+MorphInfo = namedtuple('MorphInfo', ['pos', 'lemma', 'is_name'])
+
+
+class CachedMorphAnalyzer:
+    """
+    Обертка над MorphAnalyzer с ограниченным (LRU) кэшем разборов по словоформе.
+    """
+    def __init__(self, morph=None, maxsize=DEFAULT_CACHE_SIZE):
+        """
+        Инициализация анализатора и кэша разборов.
+
+        Args:
+            morph (MorphAnalyzer, optional): Готовый экземпляр MorphAnalyzer.
+            maxsize (int): Максимальное количество словоформ в кэше.
+        """
+        if morph is None:
+            from pymorphy2 import MorphAnalyzer
+            morph = MorphAnalyzer()
+        self.morph = morph
+        self._parse = lru_cache(maxsize=maxsize)(self.morph.parse)
+
+    def parse(self, word):
+        """
+        Возвращает варианты разбора словоформы, используя кэш.
+
+        Args:
+            word (str): Словоформа.
+
+        Returns:
+            list: Список разборов pymorphy2 (не изменять, список общий для всех вызовов).
+        """
+        return self._parse(word)
+
+    def describe(self, word):
+        """
+        Возвращает сведения о словоформе по ее наиболее вероятному разбору.
+
+        Args:
+            word (str): Словоформа.
+
+        Returns:
+            MorphInfo: Часть речи (тег pymorphy2), лемма и признак имени собственного.
+        """
+        parse = self.parse(word)[0]
+        return MorphInfo(parse.tag.POS, parse.normal_form, bool(parse.tag) and 'Name' in parse.tag)
+
+    def describe_forms(self, words):
+        """
+        Строит таблицу сведений по уникальным словоформам документа.
+
+        Args:
+            words (iterable): Словоформы (повторы допускаются).
+
+        Returns:
+            dict: Словоформа → MorphInfo, по одному разбору на уникальную форму.
+        """
+        return {word: self.describe(word) for word in set(words)}
+
+    @property
+    def hits(self):
+        """
+        Количество обращений, обслуженных из кэша.
+        """
+        return self._parse.cache_info().hits
+
+    @property
+    def misses(self):
+        """
+        Количество обращений, потребовавших разбора pymorphy2.
+        """
+        return self._parse.cache_info().misses
+
+    def cache_info(self):
+        """
+        Возвращает статистику кэша.
+
+        Returns:
+            dict: Попадания, промахи, текущий и максимальный размер кэша.
+        """
+        info = self._parse.cache_info()
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'maxsize': info.maxsize
+        }
+
+    def clear_cache(self):
+        """
+        Очищает кэш разборов и сбрасывает счетчики.
+        """
+        self._parse.cache_clear()
+
+
+def get_shared_morph():
+    """
+    Возвращает общий для всего процесса кэширующий морфологический анализатор.
+
+    Returns:
+        CachedMorphAnalyzer: Единственный экземпляр анализатора в процессе.
+    """
+    global _shared_morph
+    if _shared_morph is None:
+        _shared_morph = CachedMorphAnalyzer()
+    return _shared_morph
@@ -1,37 +1,64 @@
+UNKNOWN = 'неизвестно'
+
+POS_MAP = {
+    'NOUN': 'существительное',
+    'VERB': 'глагол',
+    'ADJ': 'прилагательное',
+    'ADV': 'наречие',
+    'PRON': 'местоимение',
+    'PREP': 'предлог',
+    'CONJ': 'союз',
+    'PRCL': 'частица',
+    'NUM': 'числительное',
+    'GRND': 'деепричастие',
+    None: 'пунктуация'
+}
+
+REL_MAP = {
+    'root': 'корень',
+    'nsubj': 'подлежащее',
+    'obj': 'дополнение',
+    'iobj': 'косвенное дополнение',
+    'amod': 'определение',
+    'advmod': 'обстоятельство',
+    'case': 'падежный показатель',
+    'cc': 'соединительный союз',
+    'conj': 'связка',
+    'nmod': 'приложение',
+    'punct': 'пунктуация'
+}
+
+# Целочисленные коды читаемых названий: код — индекс в кортеже *_LABELS, 0 — "неизвестно"
+POS_LABELS = (UNKNOWN,) + tuple(dict.fromkeys(POS_MAP.values()))
+REL_LABELS = (UNKNOWN,) + tuple(dict.fromkeys(REL_MAP.values()))
+POS_CODES = {label: code for code, label in enumerate(POS_LABELS)}
+REL_CODES = {label: code for code, label in enumerate(REL_LABELS)}
+POS_TAG_CODES = {tag: POS_CODES[label] for tag, label in POS_MAP.items()}
+REL_TAG_CODES = {tag: REL_CODES[label] for tag, label in REL_MAP.items()}
+
+
 def translate_pos(pos):
     """
     Переводит теги частей речи Natasha в читаемые названия.
     """
-    pos_map = {
-        'NOUN': 'существительное',
-        'VERB': 'глагол',
-        'ADJ': 'прилагательное',
-        'ADV': 'наречие',
-        'PRON': 'местоимение',
-        'PREP': 'предлог',
-        'CONJ': 'союз',
-        'PRCL': 'частица',
-        'NUM': 'числительное',
-        'GRND': 'деепричастие',
-        None: 'пунктуация'
-    }
-    return pos_map.get(pos, 'неизвестно')
+    return POS_MAP.get(pos, UNKNOWN)
 
 def translate_rel(rel):
     """
     Переводит теги синтаксических связей Natasha в читаемые названия.
     """
-    rel_map = {
-        'root': 'корень',
-        'nsubj': 'подлежащее',
-        'obj': 'дополнение',
-        'iobj': 'косвенное дополнение',
-        'amod': 'определение',
-        'advmod': 'обстоятельство',
-        'case': 'падежный показатель',
-        'cc': 'соединительный союз',
-        'conj': 'связка',
-        'nmod': 'приложение',
-        'punct': 'пунктуация'
-    }
-    return rel_map.get(rel, 'неизвестно')
\ No newline at end of file
+    return REL_MAP.get(rel, UNKNOWN)
+
+def encode_pos_tags(tags):
+    """
+    Переводит последовательность тегов частей речи в целочисленные коды (индексы POS_LABELS).
+    """
+    get = POS_TAG_CODES.get
+    return [get(tag, 0) for tag in tags]
+
+def encode_rel_tags(tags):
+    """
+    Переводит последовательность тегов синтаксических связей в целочисленные коды (индексы REL_LABELS).
+    """
+    get = REL_TAG_CODES.get
+    return [get(tag, 0) for tag in tags]
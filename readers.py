@@ -0,0 +1,255 @@
+import glob
+import gzip
+import json
+import os
+from rtf_reader import iter_rtf_paragraphs
+
+MAX_PARAGRAPH_CHARS = 1 << 16
+
+READERS = {}
+MULTI_DOCUMENT_EXTENSIONS = set()
+
+
+def register_reader(*extensions, multi_document=False):
+    """
+    Регистрирует функцию чтения для указанных расширений файлов.
+
+    Функция принимает путь к файлу и выдает абзацы текста по мере чтения, а для
+    многодокументных форматов (корпусов JSONL) — пары (номер записи, текст документа).
+
+    Args:
+        *extensions (str): Расширения в нижнем регистре, например '.txt' или '.txt.gz'.
+        multi_document (bool): Каждый выдаваемый текст — отдельный документ со своим номером.
+    """
+    def decorator(reader):
+        for extension in extensions:
+            READERS[extension] = reader
+            if multi_document:
+                MULTI_DOCUMENT_EXTENSIONS.add(extension)
+        return reader
+    return decorator
+
+
+def _iter_text_paragraphs(lines):
+    """
+    Собирает абзацы из строк: абзацы разделяются пустыми строками, слишком длинные
+    абзацы выдаются частями по границам строк.
+    """
+    paragraph = []
+    size = 0
+    for line in lines:
+        line = line.strip()
+        if line:
+            paragraph.append(line)
+            size += len(line)
+        if paragraph and (not line or size >= MAX_PARAGRAPH_CHARS):
+            yield '\n'.join(paragraph)
+            paragraph = []
+            size = 0
+    if paragraph:
+        yield '\n'.join(paragraph)
+
+
+def _iter_jsonl_documents(lines):
+    """
+    Выдает документы JSONL-корпуса: строка JSON или объект с полем "text".
+    Документ нумеруется номером своей строки в файле (с 1), поэтому пропуск пустых
+    строк и записей не сдвигает номера следующих документов.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        text = record if isinstance(record, str) else record.get('text')
+        if text and text.strip():
+            yield number, text
+
+
+@register_reader('.rtf')
+def read_rtf(file_path):
+    return iter_rtf_paragraphs(file_path)
+
+
+@register_reader('.txt')
+def read_txt(file_path):
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from _iter_text_paragraphs(f)
+
+
+@register_reader('.txt.gz', '.gz')
+def read_txt_gz(file_path):
+    with gzip.open(file_path, 'rt', encoding='utf-8', errors='replace') as f:
+        yield from _iter_text_paragraphs(f)
+
+
+@register_reader('.jsonl', multi_document=True)
+def read_jsonl(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from _iter_jsonl_documents(f)
+
+
+@register_reader('.jsonl.gz', multi_document=True)
+def read_jsonl_gz(file_path):
+    with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+        yield from _iter_jsonl_documents(f)
+
+
+def find_extension(file_path):
+    """
+    Возвращает самое длинное зарегистрированное расширение, которым оканчивается путь, или None.
+    """
+    name = file_path.lower()
+    matches = [extension for extension in READERS if name.endswith(extension)]
+    return max(matches, key=len) if matches else None
+
+
+def is_supported(file_path):
+    """
+    Проверяет, есть ли функция чтения для файла.
+    """
+    return find_extension(file_path) is not None
+
+
+def is_multi_document(file_path):
+    """
+    Проверяет, содержит ли файл несколько документов (например, корпус JSONL).
+    """
+    return find_extension(file_path) in MULTI_DOCUMENT_EXTENSIONS
+
+
+def strip_extension(file_path):
+    """
+    Возвращает имя файла без каталога и зарегистрированного расширения.
+    """
+    name = os.path.basename(file_path)
+    extension = find_extension(name)
+    return name[:-len(extension)] if extension else os.path.splitext(name)[0]
+
+
+def relative_names(files):
+    """
+    Возвращает пути файлов относительно их общего каталога без зарегистрированных
+    расширений, сохраняя подкаталоги ('a/x.txt', 'b/x.txt' → 'a/x', 'b/x').
+
+    Args:
+        files (list): Пути к файлам.
+
+    Returns:
+        list: Относительные имена в том же порядке.
+    """
+    if not files:
+        return []
+    directories = [os.path.dirname(os.path.abspath(file_path)) for file_path in files]
+    root = os.path.commonpath(directories)
+    return [os.path.normpath(os.path.join(os.path.relpath(directory, root), strip_extension(file_path)))
+            for directory, file_path in zip(directories, files)]
+
+
+def _find_reader(file_path):
+    """
+    Возвращает функцию чтения файла.
+
+    Raises:
+        ValueError: Если формат не поддерживается.
+        FileNotFoundError: Если файл не найден.
+    """
+    extension = find_extension(file_path)
+    if extension is None:
+        raise ValueError(f"Неподдерживаемый формат файла. Поддерживаются: {', '.join(sorted(READERS))}")
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Файл {file_path} не найден")
+    return READERS[extension]
+
+
+def iter_paragraphs(file_path):
+    """
+    Потоково читает файл любого зарегистрированного формата.
+
+    Args:
+        file_path (str): Путь к файлу.
+
+    Yields:
+        str: Абзацы текста (для многодокументных форматов — тексты документов).
+
+    Raises:
+        Exception: Если формат не поддерживается, файл не найден или произошла ошибка чтения.
+    """
+    try:
+        reader = _find_reader(file_path)
+        if is_multi_document(file_path):
+            yield from (text for _, text in reader(file_path))
+        else:
+            yield from reader(file_path)
+    except Exception as e:
+        raise Exception(f"Ошибка при чтении файла: {str(e)}")
+
+
+def iter_documents(file_path):
+    """
+    Потоково читает документы многодокументного файла (корпуса JSONL).
+
+    Args:
+        file_path (str): Путь к файлу.
+
+    Yields:
+        tuple: (номер документа — номер его строки в файле, текст документа).
+
+    Raises:
+        Exception: Если формат не многодокументный, файл не найден или произошла ошибка чтения.
+    """
+    try:
+        reader = _find_reader(file_path)
+        if not is_multi_document(file_path):
+            raise ValueError(f"Файл {file_path} не является многодокументным")
+        yield from reader(file_path)
+    except Exception as e:
+        raise Exception(f"Ошибка при чтении файла: {str(e)}")
+
+
+def read_text(file_path):
+    """
+    Читает файл любого зарегистрированного формата целиком.
+    Для больших файлов лучше использовать потоковое чтение iter_paragraphs.
+
+    Returns:
+        str: Текст файла, абзацы разделены переводом строки.
+
+    Raises:
+        Exception: Если файл пуст или произошла ошибка чтения.
+    """
+    text = '\n'.join(iter_paragraphs(file_path))
+    if not text.strip():
+        raise Exception("Ошибка при чтении файла: файл пуст или содержит некорректные данные")
+    return text
+
+
+def expand_inputs(inputs):
+    """
+    Раскрывает пути, каталоги и шаблоны glob в отсортированный список поддерживаемых файлов.
+
+    Args:
+        inputs (iterable): Пути к файлам, каталогам (обходятся рекурсивно) или шаблоны ('corpus/**/*.gz').
+
+    Returns:
+        list: Пути к файлам без повторов.
+    """
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, names in os.walk(item):
+                dirs.sort()
+                files.extend(sorted(os.path.join(root, name) for name in names if is_supported(name)))
+        elif any(char in item for char in '*?['):
+            files.extend(path for path in sorted(glob.glob(item, recursive=True))
+                         if os.path.isfile(path) and is_supported(path))
+        else:
+            files.append(item)
+    return list(dict.fromkeys(files))
+
+
+def file_dialog_filter():
+    """
+    Возвращает строку фильтра для QFileDialog по зарегистрированным форматам.
+    """
+    patterns = ' '.join(f"*{extension}" for extension in sorted(READERS))
+    return f"Текстовые файлы ({patterns})"
@@ -0,0 +1,159 @@
+import shlex
+from collections import defaultdict
+
+INDEXED_FIELDS = ('lemma', 'pos', 'rel', 'semantic_role', 'head_lemma', 'head_pos', 'head_rel')
+CASE_INSENSITIVE_FIELDS = ('lemma', 'head_lemma')
+
+
+def _normalize(field, value):
+    if value is None:
+        return None
+    return value.lower() if field in CASE_INSENSITIVE_FIELDS else value
+
+
+def _token_number(node_id):
+    token = node_id.partition('_')[2]
+    return int(token) if token.isdigit() else 0
+
+
+class ResultIndex:
+    """
+    Инвертированный индекс по результатам анализа: лемма, часть речи, связь, семантическая
+    роль, а также лемма, часть речи и связь вершины (слова, к которому относится узел).
+    Пополняется по мере появления деревьев и обновляется при редактировании.
+    """
+    def __init__(self):
+        self._postings = {field: defaultdict(set) for field in INDEXED_FIELDS}
+        self._entries = {}
+
+    def add_tree(self, sentence_index, tree):
+        """
+        Индексирует дерево предложения (заменяя прежние данные этого предложения).
+
+        Args:
+            sentence_index (int): Номер предложения в результатах (с нуля).
+            tree: Дерево предложения.
+        """
+        if sentence_index in self._entries:
+            self.remove_tree(sentence_index)
+        nodes = tree.to_dict()
+        entries = []
+        for node_id, node in nodes.items():
+            head = nodes.get(node['head_id']) or {}
+            values = {
+                'lemma': node.get('lemma'),
+                'pos': node.get('pos'),
+                'rel': node.get('rel'),
+                'semantic_role': node.get('semantic_role'),
+                'head_lemma': head.get('lemma'),
+                'head_pos': head.get('pos'),
+                'head_rel': head.get('rel')
+            }
+            for field, value in values.items():
+                value = _normalize(field, value)
+                if value is not None:
+                    self._postings[field][value].add((sentence_index, node_id))
+            entries.append((node_id, values))
+        self._entries[sentence_index] = entries
+
+    update_tree = add_tree
+
+    def remove_tree(self, sentence_index):
+        """
+        Удаляет предложение из индекса.
+        """
+        for node_id, values in self._entries.pop(sentence_index, ()):
+            for field, value in values.items():
+                value = _normalize(field, value)
+                if value is None:
+                    continue
+                postings = self._postings[field].get(value)
+                if postings is not None:
+                    postings.discard((sentence_index, node_id))
+                    if not postings:
+                        del self._postings[field][value]
+
+    def clear(self):
+        """
+        Очищает индекс.
+        """
+        for postings in self._postings.values():
+            postings.clear()
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def query(self, **criteria):
+        """
+        Ищет узлы, удовлетворяющие всем условиям.
+
+        Args:
+            **criteria: Значения полей из INDEXED_FIELDS, например
+                query(pos='существительное', rel='дополнение', head_lemma='читать').
+
+        Returns:
+            list: Пары (номер предложения, ID узла), отсортированные по предложениям.
+
+        Raises:
+            ValueError: Если указано неизвестное поле.
+        """
+        unknown = set(criteria) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Неизвестные поля запроса: {', '.join(sorted(unknown))}. "
+                             f"Доступны: {', '.join(INDEXED_FIELDS)}")
+        if not criteria:
+            return [(sentence_index, node_id)
+                    for sentence_index in sorted(self._entries)
+                    for node_id, _ in self._entries[sentence_index]]
+        postings = sorted(
+            (self._postings[field].get(_normalize(field, value), set()) for field, value in criteria.items()),
+            key=len
+        )
+        matches = set(postings[0])
+        for other in postings[1:]:
+            matches &= other
+            if not matches:
+                break
+        return sorted(matches, key=lambda match: (match[0], _token_number(match[1])))
+
+    def sentences(self, **criteria):
+        """
+        Возвращает номера предложений, в которых есть узел, удовлетворяющий условиям.
+        """
+        return sorted({sentence_index for sentence_index, _ in self.query(**criteria)})
+
+    def group_by_sentence(self, matches):
+        """
+        Группирует результат query по предложениям.
+
+        Returns:
+            dict: Номер предложения → список ID узлов (в порядке следования).
+        """
+        grouped = {}
+        for sentence_index, node_id in matches:
+            grouped.setdefault(sentence_index, []).append(node_id)
+        return grouped
+
+
+def parse_query(text):
+    """
+    Разбирает строку запроса вида: lemma=книга pos=существительное rel="косвенное дополнение".
+    Слово без знака "=" считается леммой.
+
+    Args:
+        text (str): Строка запроса.
+
+    Returns:
+        dict: Условия для ResultIndex.query.
+
+    Raises:
+        ValueError: Если строка запроса некорректна.
+    """
+    criteria = {}
+    for part in shlex.split(text):
+        field, separator, value = part.partition('=')
+        if not separator:
+            field, value = 'lemma', part
+        criteria[field.strip()] = value.strip()
+    return criteria
@@ -1,6 +1,8 @@
 import json
 import os
 from data_structures import SyntaxTree
+from binary_results import write_results, BinaryResultReader
+from conllu import write_conllu, iter_conllu
 
 class ResultManager:
     """
@@ -9,9 +11,11 @@ class ResultManager:
     def save_results(self, results, file_path):
         """
         Сохраняет результаты анализа в JSON-файл.
+        Принимает список деревьев или поток, выдаваемый TextAnalyzer.iter_analyze.
         """
         try:
-            if not results:
+            data = [tree.to_dict() for tree in results]
+            if not data:
                 raise ValueError("Результаты анализа пусты")
             if not file_path.lower().endswith('.json'):
                 if not file_path.endswith('.'):
@@ -19,15 +23,16 @@ class ResultManager:
                 else:
                     file_path += 'json'
 
-            data = [tree.to_dict() for tree in results]
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
         except Exception as e:
             raise Exception(f"Ошибка при сохранении результатов: {str(e)}")
 
-    def load_results(self, file_path):
+    def load_results(self, file_path, tree_class=SyntaxTree, journal=None):
         """
         Загружает результаты анализа из JSON-файла.
+        Для больших корпусов можно передать tree_class=CompactSyntaxTree.
+        Если передан журнал правок (EditJournal), его записи применяются к загруженным деревьям.
         """
         try:
             if not os.path.exists(file_path):
@@ -41,32 +46,142 @@ class ResultManager:
             if not data:
                 raise ValueError("Файл JSON пуст")
 
-            results = []
-            for tree_data in data:
-                tree = SyntaxTree()
-                for node_id, node in tree_data.items():
-                    tree.add_node(
-                        node_id=node_id,
-                        text=node['text'],
-                        pos=node['pos'],
-                        head_id=node['head_id'],
-                        rel=node['rel'],
-                        lemma=node.get('lemma'),
-                        semantic_role=node.get('semantic_role'),
-                        word_meaning=node.get('word_meaning')
-                    )
-                results.append(tree)
-            
+            results = [self._tree_from_dict(tree_data, tree_class) for tree_data in data]
+            if journal is not None:
+                journal.replay(results)
             return results
         except Exception as e:
             raise Exception(f"Ошибка при загрузке результатов: {str(e)}")
 
+    def compact_results(self, results, file_path, journal):
+        """
+        Сжимает журнал правок: результаты целиком записываются в JSON-файл
+        (через временный файл), после чего журнал очищается.
+        """
+        try:
+            base, extension = os.path.splitext(file_path)
+            temp_path = f"{base}.compacting{extension or '.json'}"
+            self.save_results(results, temp_path)
+            os.replace(temp_path, file_path)
+            journal.clear()
+            journal.rebase()
+        except Exception as e:
+            raise Exception(f"Ошибка при сжатии журнала правок: {str(e)}")
+
+    def save_results_jsonl(self, results, file_path):
+        """
+        Сохраняет результаты в формате JSON Lines: одно дерево предложения на строку.
+        Деревья записываются по мере поступления, поэтому results может быть потоком.
+
+        Returns:
+            int: Количество записанных предложений.
+        """
+        try:
+            if not file_path.lower().endswith('.jsonl'):
+                if not file_path.endswith('.'):
+                    file_path += '.jsonl'
+                else:
+                    file_path += 'jsonl'
+
+            count = 0
+            with open(file_path, 'w', encoding='utf-8') as f:
+                for tree in results:
+                    f.write(json.dumps(tree.to_dict(), ensure_ascii=False))
+                    f.write('\n')
+                    count += 1
+            if count == 0:
+                os.remove(file_path)
+                raise ValueError("Результаты анализа пусты")
+            return count
+        except Exception as e:
+            raise Exception(f"Ошибка при сохранении результатов: {str(e)}")
+
+    def iter_results_jsonl(self, file_path, tree_class=SyntaxTree):
+        """
+        Лениво читает результаты из файла JSON Lines, выдавая по одному дереву.
+        """
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Файл {file_path} не найден")
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield self._tree_from_dict(json.loads(line), tree_class)
+        except Exception as e:
+            raise Exception(f"Ошибка при загрузке результатов: {str(e)}")
+
+    def save_results_binary(self, results, file_path):
+        """
+        Сохраняет результаты анализа в компактный бинарный файл (.bin) с таблицей строк
+        и индексом предложений. JSON остается форматом для обмена данными.
+        """
+        try:
+            if not file_path.lower().endswith('.bin'):
+                if not file_path.endswith('.'):
+                    file_path += '.bin'
+                else:
+                    file_path += 'bin'
+
+            if write_results(results, file_path) == 0:
+                os.remove(file_path)
+                raise ValueError("Результаты анализа пусты")
+        except Exception as e:
+            raise Exception(f"Ошибка при сохранении результатов: {str(e)}")
+
+    def open_results_binary(self, file_path, tree_class=SyntaxTree):
+        """
+        Открывает бинарный файл результатов без декодирования всего содержимого.
+        Возвращает BinaryResultReader: len(), доступ к предложению по индексу, итерация.
+        """
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Файл {file_path} не найден")
+            return BinaryResultReader(file_path, tree_class=tree_class)
+        except Exception as e:
+            raise Exception(f"Ошибка при загрузке результатов: {str(e)}")
+
+    def save_results_conllu(self, results, file_path):
+        """
+        Сохраняет результаты в формате CoNLL-U для инструментов работы с трибанками.
+        Предложения записываются по мере поступления, поэтому results может быть потоком.
+
+        Returns:
+            int: Количество записанных предложений.
+        """
+        try:
+            if not file_path.lower().endswith('.conllu'):
+                if not file_path.endswith('.'):
+                    file_path += '.conllu'
+                else:
+                    file_path += 'conllu'
+
+            count = write_conllu(results, file_path)
+            if count == 0:
+                os.remove(file_path)
+                raise ValueError("Результаты анализа пусты")
+            return count
+        except Exception as e:
+            raise Exception(f"Ошибка при сохранении результатов: {str(e)}")
+
+    def iter_results_conllu(self, file_path, tree_class=SyntaxTree):
+        """
+        Лениво читает результаты из файла CoNLL-U, выдавая по одному дереву.
+        """
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Файл {file_path} не найден")
+            yield from iter_conllu(file_path, tree_class)
+        except Exception as e:
+            raise Exception(f"Ошибка при загрузке результатов: {str(e)}")
+
     def document_results(self, results, file_path):
         """
         Документирует результаты в текстовом формате для отчета.
+        Принимает список деревьев или поток, выдаваемый TextAnalyzer.iter_analyze;
+        предложения записываются по мере поступления.
         """
         try:
-            if not results:
+            if isinstance(results, list) and not results:
                 raise ValueError("Результаты анализа пусты")
             if not file_path.lower().endswith('.txt'):
                 if not file_path.endswith('.'):
@@ -74,6 +189,7 @@ class ResultManager:
                 else:
                     file_path += 'txt'
 
+            i = None
             with open(file_path, 'w', encoding='utf-8') as f:
                 for i, tree in enumerate(results):
                     f.write(f"Предложение {i+1}:\n")
@@ -86,34 +202,49 @@ class ResultManager:
                             f"Значение слова: {node.get('word_meaning', '')}\n"
                         )
                     f.write("\n")
+            if i is None:
+                raise ValueError("Результаты анализа пусты")
         except Exception as e:
             raise Exception(f"Ошибка при документировании результатовlift: {str(e)}")
 
+    def _tree_from_dict(self, tree_data, tree_class=SyntaxTree):
+        """
+        Восстанавливает дерево из словаря узлов, полученного через to_dict.
+        """
+        return tree_class.from_dict(tree_data)
+
     def edit_result(self, results, sentence_index, node_id, new_head_id=None, new_rel=None, new_pos=None, 
-                    new_lemma=None, new_semantic_role=None, new_word_meaning=None):
+                    new_lemma=None, new_semantic_role=None, new_word_meaning=None, journal=None, stats=None):
         """
         Редактирует параметры узла в дереве анализа.
+        Если передан журнал правок (EditJournal), правка дописывается в него;
+        если передана статистика (CorpusStatistics), ее счетчики обновляются.
         """
         try:
             if not (0 <= sentence_index < len(results)):
                 raise ValueError("Некорректный индекс предложения")
             tree = results[sentence_index]
-            if node_id not in tree.nodes:
+            if node_id not in tree:
                 raise ValueError(f"Узел с ID {node_id} не найден")
 
-            if new_head_id is not None:
-                tree.nodes[node_id]['head_id'] = new_head_id
-            if new_rel is not None:
-                tree.nodes[node_id]['rel'] = new_rel
-            if new_pos is not None:
-                tree.nodes[node_id]['pos'] = new_pos
-            if new_lemma is not None:
-                tree.nodes[node_id]['lemma'] = new_lemma
-            if new_semantic_role is not None:
-                tree.nodes[node_id]['semantic_role'] = new_semantic_role
-            if new_word_meaning is not None:
-                tree.nodes[node_id]['word_meaning'] = new_word_meaning
-            
+            fields = {
+                'head_id': new_head_id,
+                'rel': new_rel,
+                'pos': new_pos,
+                'lemma': new_lemma,
+                'semantic_role': new_semantic_role,
+                'word_meaning': new_word_meaning
+            }
+            fields = {field: value for field, value in fields.items() if value is not None}
+            if journal is not None or stats is not None:
+                node = tree.get_node(node_id)
+                changes = {field: (node.get(field), value) for field, value in fields.items()}
+                if journal is not None:
+                    journal.record(sentence_index, node_id, changes)
+                if stats is not None:
+                    stats.update_fields(changes)
+            tree.update_node(node_id, **fields)
+
             return results
         except Exception as e:
             raise Exception(f"Ошибка при редактировании результатов: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,186 @@
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+COLUMNS = [
+    "Идентификатор", "Слово", "Часть речи", "Член предложения",
+    "К какому слову относится", "Лемма", "Семантическая роль",
+    "Значение слова"
+]
+NODE_FIELDS = ['text', 'pos', 'rel', 'head_id', 'lemma', 'semantic_role', 'word_meaning']
+SENTENCE_BATCH = 500
+
+
+class ResultTreeModel(QAbstractItemModel):
+    """
+    Модель результатов анализа для QTreeView: предложения верхнего уровня и их токены.
+    Предложения подгружаются порциями, а токены — только при раскрытии предложения,
+    поэтому представление не создает элементы для всего документа сразу.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+        self._fetched_sentences = 0
+        self._node_ids = {}
+        self._filter = None
+        self._rows = None
+        self._row_of = None
+
+    def set_results(self, results):
+        """
+        Заменяет отображаемые результаты.
+
+        Args:
+            results (list): Список деревьев (модель использует этот же список).
+        """
+        self.beginResetModel()
+        self.results = results
+        self._fetched_sentences = 0
+        self._node_ids = {}
+        self._filter = None
+        self._rows = None
+        self._row_of = None
+        self.endResetModel()
+
+    def set_filter(self, matches):
+        """
+        Оставляет видимыми только найденные узлы и их предложения.
+
+        Args:
+            matches (dict): Номер предложения → список ID узлов (см. ResultIndex.group_by_sentence)
+                или None, чтобы снять фильтр.
+        """
+        self.beginResetModel()
+        self._node_ids = {}
+        self._filter = matches
+        if matches is None:
+            self._rows = None
+            self._row_of = None
+            self._fetched_sentences = min(len(self.results), SENTENCE_BATCH)
+        else:
+            self._rows = sorted(matches)
+            self._row_of = {sentence_index: row for row, sentence_index in enumerate(self._rows)}
+        self.endResetModel()
+
+    def sentence_index(self, row):
+        """
+        Возвращает номер предложения в результатах для строки верхнего уровня.
+        """
+        return self._rows[row] if self._rows is not None else row
+
+    def sentence_row(self, sentence_index):
+        """
+        Возвращает строку верхнего уровня для номера предложения или None, если предложение
+        не показано (скрыто фильтром или еще не подгружено).
+        """
+        if self._row_of is not None:
+            return self._row_of.get(sentence_index)
+        return sentence_index if sentence_index < self._fetched_sentences else None
+
+    def append_tree(self, tree):
+        """
+        Добавляет дерево очередного предложения в конец результатов.
+        """
+        self.results.append(tree)
+        if self._filter is None and self._fetched_sentences == len(self.results) - 1:
+            row = self._fetched_sentences
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._fetched_sentences += 1
+            self.endInsertRows()
+
+    def update_node(self, sentence_index, node_id):
+        """
+        Сообщает представлению об изменении одного узла, не перестраивая остальные строки.
+        """
+        node_ids = self._node_ids.get(sentence_index)
+        parent_row = self.sentence_row(sentence_index)
+        if node_ids is None or node_id not in node_ids or parent_row is None:
+            return
+        row = node_ids.index(node_id)
+        parent = self.index(parent_row, 0)
+        self.dataChanged.emit(self.index(row, 0, parent), self.index(row, len(COLUMNS) - 1, parent))
+
+    def sentence_node(self, index):
+        """
+        Возвращает (номер предложения, ID узла) для строки токена или None для строки предложения.
+        """
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        sentence_index = index.internalId() - 1
+        return sentence_index, self._node_ids[sentence_index][index.row()]
+
+    # Внутренний идентификатор индекса: 0 — строка предложения, i + 1 — токен предложения i
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, self.sentence_index(parent.row()) + 1)
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(self.sentence_row(index.internalId() - 1), 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._rows) if self._rows is not None else self._fetched_sentences
+        if parent.internalId() != 0 or parent.column() != 0:
+            return 0
+        return len(self._node_ids.get(self.sentence_index(parent.row()), ()))
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.results)
+        return parent.internalId() == 0 and parent.column() == 0
+
+    def canFetchMore(self, parent):
+        if not parent.isValid():
+            return self._rows is None and self._fetched_sentences < len(self.results)
+        return parent.internalId() == 0 and self.sentence_index(parent.row()) not in self._node_ids
+
+    def fetchMore(self, parent):
+        if not parent.isValid():
+            if self._rows is not None:
+                return
+            count = min(SENTENCE_BATCH, len(self.results) - self._fetched_sentences)
+            if count <= 0:
+                return
+            self.beginInsertRows(QModelIndex(), self._fetched_sentences, self._fetched_sentences + count - 1)
+            self._fetched_sentences += count
+            self.endInsertRows()
+            return
+        sentence_index = self.sentence_index(parent.row())
+        if self._filter is not None:
+            node_ids = list(self._filter.get(sentence_index, ()))
+        else:
+            node_ids = self.results[sentence_index].node_ids()
+        if node_ids:
+            self.beginInsertRows(parent, 0, len(node_ids) - 1)
+            self._node_ids[sentence_index] = node_ids
+            self.endInsertRows()
+        else:
+            self._node_ids[sentence_index] = node_ids
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() == 0:
+            if role == Qt.DisplayRole and index.column() == 0:
+                return f"Предложение {self.sentence_index(index.row()) + 1}"
+            return None
+        sentence_index, node_id = self.sentence_node(index)
+        if role == Qt.UserRole:
+            return sentence_index, node_id
+        if role != Qt.DisplayRole:
+            return None
+        if index.column() == 0:
+            return node_id
+        value = self.results[sentence_index].get_node(node_id).get(NODE_FIELDS[index.column() - 1])
+        return '' if value is None else value
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
@@ -1,5 +1,30 @@
 from striprtf.striprtf import rtf_to_text
+import codecs
 import os
+import re
+
+CHUNK_SIZE = 1 << 20
+HEADER_SIZE = 1 << 16
+# Наибольшая длина управляющего слова с параметром, переносимого в следующий блок
+MAX_CONTROL_LENGTH = 64
+
+# Группы-назначения, содержимое которых не является текстом документа
+SKIP_DESTINATIONS = {
+    'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'header', 'footer', 'headerl', 'headerr',
+    'footerl', 'footerr', 'listtable', 'listoverridetable', 'rsidtbl', 'generator', 'themedata',
+    'datastore', 'latentstyles', 'object', 'xmlnstbl', 'filetbl', 'revtbl'
+}
+PARAGRAPH_WORDS = {'par', 'sect', 'page'}
+SPECIAL_CHARS = {
+    'line': '\n', 'tab': '\t', 'emdash': '\u2014', 'endash': '\u2013', 'emspace': ' ', 'enspace': ' ',
+    'qmspace': ' ', 'bullet': '\u2022', 'lquote': '\u2018', 'rquote': '\u2019',
+    'ldblquote': '\u201c', 'rdblquote': '\u201d'
+}
+SPECIAL_SYMBOLS = {'\\': '\\', '{': '{', '}': '}', '~': '\u00a0', '_': '-', '-': ''}
+RTF_TOKEN = re.compile(
+    r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\([\s\S])|([{}])|[\r\n]+|([^\\{}\r\n]+)"
+)
+CODEPAGE = re.compile(rb"\\ansicpg(\d+)")
 
 def read_rtf_file(file_path):
     """
@@ -36,4 +61,171 @@ def read_rtf_file(file_path):
         return text.strip()
     
     except Exception as e:
-        raise Exception(f"Ошибка при чтении RTF-файла: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Ошибка при чтении RTF-файла: {str(e)}")
+
+
+def _detect_encodings(header):
+    """
+    Определяет кодировки RTF-файла по его началу.
+
+    Returns:
+        tuple: (кодировка для 8-битных символов в тексте, кодовая страница для \\'hh).
+    """
+    match = CODEPAGE.search(header)
+    codepage = f"cp{match.group(1).decode('ascii')}" if match else 'cp1252'
+    try:
+        codecs.lookup(codepage)
+    except LookupError:
+        codepage = 'cp1252'
+    # Некоторые редакторы пишут текст в UTF-8, несмотря на объявленную кодовую страницу
+    raw_encoding = codepage
+    if not header.isascii():
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(header)
+            raw_encoding = 'utf-8'
+        except UnicodeDecodeError:
+            pass
+    return raw_encoding, codepage
+
+
+def iter_rtf_paragraphs(file_path, chunk_size=CHUNK_SIZE, encoding=None):
+    """
+    Потоково читает RTF-файл и выдает абзацы (разделенные \\par) по мере чтения.
+
+    Файл читается блоками и декодируется по объявленной кодовой странице (\\ansicpg),
+    поэтому память не зависит от размера файла. Последовательности \\'hh декодируются
+    вместе, поэтому многобайтовые символы (например, cp932) собираются правильно.
+
+    Args:
+        file_path (str): Путь к RTF-файлу.
+        chunk_size (int): Размер читаемого блока в байтах.
+        encoding (str, optional): Кодировка 8-битных символов текста; по умолчанию
+            определяется автоматически (UTF-8 или объявленная кодовая страница).
+
+    Yields:
+        str: Текст очередного непустого абзаца.
+
+    Raises:
+        Exception: Если файл не найден, не в формате RTF или произошла ошибка чтения.
+    """
+    try:
+        if not file_path.lower().endswith('.rtf'):
+            raise ValueError("Файл должен быть в формате RTF")
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Файл {file_path} не найден")
+
+        with open(file_path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+            if not header.lstrip().startswith(b'{\\rtf'):
+                raise ValueError("Файл RTF пуст или содержит некорректные данные")
+            raw_encoding, codepage = _detect_encodings(header)
+            if encoding:
+                raw_encoding = encoding
+            decoder = codecs.getincrementaldecoder(raw_encoding)(errors='replace')
+            hex_decoder = codecs.getincrementaldecoder(codepage)(errors='replace')
+            hex_pending = False
+
+            paragraph = []
+            stack = []
+            skip = False
+            uc = 1
+            skip_chars = 0
+            group_start = False
+            pending = ''
+            data = header
+            while True:
+                final = not data
+                buffer = pending + decoder.decode(data, final=final)
+                pending = ''
+                if not final:
+                    # Управляющая последовательность в конце блока может быть незавершенной и
+                    # обрабатывается со следующим блоком. Последняя обратная косая черта начинает
+                    # последовательность, только если ей предшествует четное число таких же
+                    # (иначе это вторая половина экранированной пары \\).
+                    cut = buffer.rfind('\\')
+                    if cut != -1 and len(buffer) - cut < MAX_CONTROL_LENGTH:
+                        run_start = cut
+                        while run_start > 0 and buffer[run_start - 1] == '\\':
+                            run_start -= 1
+                        if (cut - run_start) % 2 == 0:
+                            buffer, pending = buffer[:cut], buffer[cut:]
+
+                for match in RTF_TOKEN.finditer(buffer):
+                    word, param, hex_code, symbol, brace, text = match.groups()
+                    if hex_pending and hex_code is None:
+                        paragraph.append(hex_decoder.decode(b'', final=True))
+                        hex_decoder.reset()
+                        hex_pending = False
+                    at_group_start = group_start
+                    group_start = False
+                    if brace == '{':
+                        stack.append((skip, uc))
+                        group_start = True
+                        continue
+                    if brace == '}':
+                        if stack:
+                            skip, uc = stack.pop()
+                        skip_chars = 0
+                        continue
+                    if word is not None:
+                        if at_group_start and word in SKIP_DESTINATIONS:
+                            skip = True
+                        if skip:
+                            continue
+                        if word == 'uc':
+                            uc = int(param or 1)
+                        elif word == 'u':
+                            code = int(param or 0)
+                            paragraph.append(chr(code + 65536 if code < 0 else code))
+                            skip_chars = uc
+                        elif word in PARAGRAPH_WORDS:
+                            value = ''.join(paragraph).strip()
+                            paragraph = []
+                            skip_chars = 0
+                            if value:
+                                yield value
+                        elif word in SPECIAL_CHARS:
+                            paragraph.append(SPECIAL_CHARS[word])
+                        continue
+                    if symbol is not None:
+                        if symbol == '*' and at_group_start:
+                            skip = True
+                        if skip:
+                            continue
+                        if symbol in '\r\n':
+                            value = ''.join(paragraph).strip()
+                            paragraph = []
+                            if value:
+                                yield value
+                        elif symbol in SPECIAL_SYMBOLS:
+                            if skip_chars:
+                                skip_chars -= 1
+                            else:
+                                paragraph.append(SPECIAL_SYMBOLS[symbol])
+                        continue
+                    if skip:
+                        continue
+                    if hex_code is not None:
+                        if skip_chars:
+                            skip_chars -= 1
+                        else:
+                            paragraph.append(hex_decoder.decode(bytes([int(hex_code, 16)])))
+                            hex_pending = True
+                    elif text is not None:
+                        if skip_chars:
+                            dropped = min(skip_chars, len(text))
+                            skip_chars -= dropped
+                            text = text[dropped:]
+                        paragraph.append(text)
+
+                if final:
+                    break
+                data = file.read(chunk_size)
+
+            if hex_pending:
+                paragraph.append(hex_decoder.decode(b'', final=True))
+            value = ''.join(paragraph).strip()
+            if value:
+                yield value
+    except Exception as e:
+        raise Exception(f"Ошибка при чтении RTF-файла: {str(e)}")
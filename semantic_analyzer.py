@@ -1,20 +1,99 @@
-from pymorphy2 import MorphAnalyzer
-from ruwordnet import RuWordNet
+import json
+import os
+from functools import lru_cache
+from morph_cache import get_shared_morph
+from wordnet_index import DefinitionIndex
+from pos_rel_translations import POS_LABELS, REL_LABELS
+
+DEFINITION_CACHE_SIZE = 50000
+DEFAULT_ROLE_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'semantic_roles.json')
+
+
+def load_role_rules(file_path=DEFAULT_ROLE_RULES):
+    """
+    Загружает правила назначения семантических ролей из JSON-файла.
+
+    Args:
+        file_path (str): Путь к файлу со списком правил {"pos": ..., "rel": ..., "role": ...}.
+
+    Если для пары части речи и связи задано несколько правил, действует первое из них.
+
+    Returns:
+        dict: (часть речи, синтаксическая связь) → семантическая роль.
+
+    Raises:
+        Exception: Если файл не читается или правило ссылается на неизвестную
+            часть речи или связь (см. pos_rel_translations.py).
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+        role_rules = {}
+        for number, rule in enumerate(rules, 1):
+            if rule['pos'] not in POS_LABELS:
+                raise ValueError(f"правило {number}: неизвестная часть речи '{rule['pos']}'")
+            if rule['rel'] not in REL_LABELS:
+                raise ValueError(f"правило {number}: неизвестная связь '{rule['rel']}'")
+            role_rules.setdefault((rule['pos'], rule['rel']), rule['role'])
+        return role_rules
+    except Exception as e:
+        raise Exception(f"Ошибка загрузки правил семантических ролей: {str(e)}")
+
 
 class SemanticAnalyzer:
     """
     Класс для выполнения семантического анализа текста с использованием RuWordNet.
     """
-    def __init__(self):
+    def __init__(self, morph=None, definition_index=None, role_rules=DEFAULT_ROLE_RULES):
         """
         Инициализация морфологического анализатора и RuWordNet.
+
+        Args:
+            morph (CachedMorphAnalyzer, optional): Кэширующий морфологический анализатор.
+                По умолчанию используется общий для процесса экземпляр.
+            definition_index (str, optional): Путь к индексу определений, построенному
+                wordnet_index.py. Если задан, RuWordNet не загружается.
+            role_rules (str): Путь к файлу правил семантических ролей.
+        """
+        self.morph = morph or get_shared_morph()
+        self.definition_index_path = definition_index
+        self.wn = None
+        self.definition_index = None
+        self.reconnect()
+        self.resolve_definition = lru_cache(maxsize=DEFINITION_CACHE_SIZE)(self._resolve_definition)
+
+        # Правила ролей компилируются в таблицу по кодам части речи и связи
+        self.role_rules = load_role_rules(role_rules)
+        self.role_table = [[self.role_rules.get((pos, rel)) for rel in REL_LABELS] for pos in POS_LABELS]
+
+    def reconnect(self):
+        """
+        Открывает (заново) соединение с индексом определений или RuWordNet.
+        Нужно вызывать в дочернем процессе, если анализатор был создан до fork.
+
+        Raises:
+            Exception: Если не удалось открыть RuWordNet или индекс.
         """
-        self.morph = MorphAnalyzer()
         try:
-            self.wn = RuWordNet()  # Инициализация RuWordNet
+            if self.definition_index_path:
+                self.definition_index = DefinitionIndex(self.definition_index_path)
+            else:
+                from ruwordnet import RuWordNet
+                self.wn = RuWordNet()  # Инициализация RuWordNet
         except Exception as e:
             raise Exception(f"Ошибка инициализации RuWordNet: {str(e)}")
 
+    def close(self):
+        """
+        Закрывает соединение с индексом определений или RuWordNet.
+        """
+        if self.definition_index is not None:
+            self.definition_index.close()
+            self.definition_index = None
+        if self.wn is not None:
+            self.wn.session.close()
+            self.wn = None
+
     def lemmatize(self, word):
         """
         Выполняет лемматизацию слова.
@@ -38,27 +117,23 @@ class SemanticAnalyzer:
         Returns:
             str: Семантическая роль (или None, если не определена).
         """
-        if rel == "подлежащее" and pos == "существительное":
-            return "агент"
-        elif rel == "дополнение" and pos == "существительное":
-            return "пациент"
-        elif rel == "сказуемое" and pos in ["глагол", "деепричастие"]:  # Добавляем деепричастие
-            return "действие"
-        elif rel == "косвенное дополнение" and pos == "существительное":
-            return "место"
-        elif rel == "определение" and pos == "прилагательное":
-            return "характеристика"
-        elif rel == "связка" and pos == "прилагательное":
-            return "характеристика"
-        elif rel == "падежный показатель" and pos == "предлог":
-            return "указатель места"
-        elif rel == "соединительный союз" and pos == "союз":
-            return "связка"
-        elif rel == "обстоятельство" and pos == "деепричастие":  # Деепричастие как обстоятельство
-            return "действие"
-        return None
-
-    def get_word_meaning(self, lemma, pos, rel, text):
+        return self.role_rules.get((pos, rel))
+
+    def assign_roles(self, pos_codes, rel_codes):
+        """
+        Определяет семантические роли сразу для всех токенов предложения или документа.
+
+        Args:
+            pos_codes (list): Коды частей речи (индексы POS_LABELS).
+            rel_codes (list): Коды синтаксических связей (индексы REL_LABELS).
+
+        Returns:
+            list: Семантические роли (None, если роль не определена).
+        """
+        table = self.role_table
+        return [table[pos][rel] for pos, rel in zip(pos_codes, rel_codes)]
+
+    def get_word_meaning(self, lemma, pos, rel, text, is_name=None):
         """
         Возвращает значение слова на основе леммы, части речи, синтаксической связи и текста.
 
@@ -67,6 +142,8 @@ class SemanticAnalyzer:
             pos (str): Часть речи.
             rel (str): Синтаксическая связь.
             text (str): Исходный текст токена.
+            is_name (bool, optional): Есть ли у разбора тег Name. Если не задан,
+                слово разбирается заново.
 
         Returns:
             str: Значение слова (или "неизвестно", если не найдено).
@@ -79,27 +156,48 @@ class SemanticAnalyzer:
             return "Знак препинания"
 
         # Имена собственные (проверяем заглавную букву и тег pymorphy2)
-        parse = self.morph.parse(text)[0]
-        if parse.tag and 'Name' in parse.tag and text[0].isupper():
+        if is_name is None:
+            is_name = self.morph.describe(text).is_name
+        if is_name and text[0].isupper():
             return "Имя собственное"
 
         # Извлечение значения из RuWordNet для существительных, глаголов, прилагательных, деепричастий
         if pos in ["существительное", "глагол", "прилагательное", "деепричастие"]:
             try:
-                # Пробуем найти синсеты по лемме
-                synsets = self.wn.get_synsets(lemma_lower)
-                if not synsets:
-                    # Если по лемме не найдено, пробуем исходное слово
-                    synsets = self.wn.get_synsets(text_lower)
-                # Проверяем все синсеты, выбираем первый с определением
-                for synset in synsets:
-                    if synset.definition:
-                        # Приводим к нормальному регистру: первая буква заглавная
-                        return synset.definition.capitalize()
-                return "неизвестно"
+                return self.resolve_definition(lemma_lower, text_lower)
             except Exception as e:
                 print(f"Ошибка получения значения для леммы '{lemma}': {str(e)}")
                 return "неизвестно"
 
         # Для остальных слов (предлоги, союзы, наречия) возвращаем "неизвестно"
+        return "неизвестно"
+
+    def _resolve_definition(self, lemma_lower, text_lower):
+        """
+        Находит определение по лемме, а если лемма неизвестна — по исходному слову.
+        Результат запоминается в resolve_definition.
+
+        Args:
+            lemma_lower (str): Лемма в нижнем регистре.
+            text_lower (str): Исходное слово в нижнем регистре.
+
+        Returns:
+            str: Определение с заглавной буквы (или "неизвестно").
+        """
+        if self.definition_index is not None:
+            found, definition = self.definition_index.lookup(lemma_lower)
+            if not found:
+                found, definition = self.definition_index.lookup(text_lower)
+            return definition.capitalize() if definition else "неизвестно"
+
+        # Пробуем найти синсеты по лемме
+        synsets = self.wn.get_synsets(lemma_lower)
+        if not synsets:
+            # Если по лемме не найдено, пробуем исходное слово
+            synsets = self.wn.get_synsets(text_lower)
+        # Проверяем все синсеты, выбираем первый с определением
+        for synset in synsets:
+            if synset.definition:
+                # Приводим к нормальному регистру: первая буква заглавная
+                return synset.definition.capitalize()
         return "неизвестно"
\ No newline at end of file
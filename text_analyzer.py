@@ -1,33 +1,100 @@
-from natasha import Segmenter, NewsEmbedding, NewsSyntaxParser, Doc
-from pymorphy2 import MorphAnalyzer
+from morph_cache import get_shared_morph
 from data_structures import SyntaxTree
-from pos_rel_translations import translate_pos, translate_rel
+from pos_rel_translations import POS_LABELS, REL_LABELS, encode_pos_tags, encode_rel_tags
 from semantic_analyzer import SemanticAnalyzer
-import time
+from metrics import AnalysisMetrics
+from contextlib import contextmanager
+import threading
+
+SYNTAX_BATCH_SIZE = 64
+SYNTAX_BATCH_TOKENS = 4096
 
 class TextAnalyzer:
     """
     Класс для выполнения синтаксического и семантического анализа текста на русском языке.
     """
-    def __init__(self):
+    def __init__(self, definition_index=None, lazy=False, tree_class=SyntaxTree,
+                 metrics_callback=None, profile=False, trace_memory=False,
+                 syntax_batch_size=SYNTAX_BATCH_SIZE, syntax_batch_tokens=SYNTAX_BATCH_TOKENS,
+                 sort_syntax_batches=True):
         """
         Инициализация компонентов Natasha, pymorphy2 и семантического анализатора.
+
+        Args:
+            definition_index (str, optional): Путь к индексу определений RuWordNet
+                (см. wordnet_index.py).
+            lazy (bool): Отложить загрузку моделей до первого анализа или вызова load().
+            tree_class (type): Класс деревьев результата (SyntaxTree или CompactSyntaxTree).
+            metrics_callback (callable, optional): Вызывается с AnalysisMetrics после
+                каждого завершенного анализа.
+            profile (bool): Собирать профиль cProfile при каждом анализе.
+            trace_memory (bool): Замерять пик выделенной памяти через tracemalloc.
+            syntax_batch_size (int): Максимум предложений в одной пачке синтаксического анализа;
+                задает и размер пачки вывода модели slovnet. Большие пачки повышают
+                пропускную способность, малые — снижают задержку и память.
+            syntax_batch_tokens (int, optional): Максимум токенов в одной пачке (None — без ограничения).
+            sort_syntax_batches (bool): Группировать в пачки предложения близкой длины,
+                чтобы уменьшить выравнивание (padding) внутри пачки.
         """
-        try:
-            self.segmenter = Segmenter()
-            self.morph = MorphAnalyzer()
-            self.emb = NewsEmbedding()
-            self.syntax_parser = NewsSyntaxParser(self.emb)
-            self.semantic_analyzer = SemanticAnalyzer()
-        except Exception as e:
-            raise Exception(f"Ошибка инициализации: {str(e)}")
+        self.definition_index = definition_index
+        self.tree_class = tree_class
+        self.metrics_callback = metrics_callback
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.last_metrics = None
+        self.syntax_batch_size = syntax_batch_size
+        self.syntax_batch_tokens = syntax_batch_tokens
+        self.sort_syntax_batches = sort_syntax_batches
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        if not lazy:
+            self.load()
+
+    @property
+    def is_loaded(self):
+        """
+        Загружены ли модели Natasha, pymorphy2 и RuWordNet.
+        """
+        return self._loaded
+
+    def load(self):
+        """
+        Загружает модели, если они еще не загружены. Безопасно вызывать из нескольких потоков.
 
-    def analyze(self, text):
+        Raises:
+            Exception: Если произошла ошибка при загрузке моделей.
+        """
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                from natasha import Segmenter, NewsEmbedding, NewsSyntaxParser
+                self.segmenter = Segmenter()
+                self.morph = get_shared_morph()
+                self.emb = NewsEmbedding()
+                self.syntax_parser = NewsSyntaxParser(self.emb)
+                # slovnet сам режет вход на пачки (по умолчанию по 8) и в map, и в кодировщике
+                self.syntax_parser.batch_size = self.syntax_batch_size
+                self.syntax_parser.infer.encoder.batch_size = self.syntax_batch_size
+                self.semantic_analyzer = SemanticAnalyzer(morph=self.morph, definition_index=self.definition_index)
+            except Exception as e:
+                raise Exception(f"Ошибка инициализации: {str(e)}")
+            self._loaded = True
+
+    def new_metrics(self):
+        """
+        Создает объект метрик с настройками профилирования анализатора.
+        """
+        return AnalysisMetrics(profile=self.profile, trace_memory=self.trace_memory)
+
+    def analyze(self, text, metrics=None):
         """
         Выполняет синтаксический и семантический анализ текста.
 
         Args:
             text (str): Входной текст для анализа.
+            metrics (AnalysisMetrics, optional): Объект, в который добавляются замеры.
+                Если не указан, создается новый и сохраняется в last_metrics.
 
         Returns:
             list: Список объектов SyntaxTree, представляющих деревья для каждого предложения.
@@ -37,51 +104,405 @@ class TextAnalyzer:
             Exception: Если произошла ошибка при анализе.
         """
         try:
-            start_time = time.time()
             # Проверка на пустой текст
             if not text or not text.strip():
                 raise ValueError("Входной текст пуст")
 
-            # Создание объекта Doc для обработки текста
-            doc = Doc(text)
-            
-            # Сегментация текста на предложения
-            doc.segment(self.segmenter)
-            
-            # Морфологический анализ с использованием pymorphy2
-            for sent in doc.sents:
-                for token in sent.tokens:
-                    parse = self.morph.parse(token.text)[0]
-                    token.pos = parse.tag.POS
-
-            # Синтаксический анализ
-            doc.parse_syntax(self.syntax_parser)
-
-            # Формирование списка синтаксических деревьев с переводом тегов и семантикой
-            results = []
-            for sent in doc.sents:
-                tree = SyntaxTree()
-                sentence_text = sent.text
-                for token in sent.tokens:
-                    pos = translate_pos(token.pos)
-                    rel = translate_rel(token.rel)
-                    lemma = self.semantic_analyzer.lemmatize(token.text)
-                    semantic_role = self.semantic_analyzer.determine_semantic_role(pos, rel)
-                    word_meaning = self.semantic_analyzer.get_word_meaning(lemma, pos, rel, token.text)
-                    tree.add_node(
-                        node_id=token.id,
-                        text=token.text,
-                        pos=pos,
-                        head_id=token.head_id,
-                        rel=rel,
-                        lemma=lemma,
-                        semantic_role=semantic_role,
-                        word_meaning=word_meaning
-                    )
-                results.append(tree)
-            
-            print(f"Время анализа: {time.time() - start_time} секунд")
+            self.load()
+            with self._measure(metrics) as metrics:
+                results = self._analyze_chunk(text, metrics=metrics)
             return results
 
         except Exception as e:
-            raise Exception(f"Ошибка при синтаксическом анализе: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Ошибка при синтаксическом анализе: {str(e)}")
+
+    def analyze_with_metrics(self, text):
+        """
+        Выполняет анализ текста и возвращает результаты вместе с метриками.
+
+        Returns:
+            tuple: (список деревьев, AnalysisMetrics).
+        """
+        metrics = self.new_metrics()
+        metrics.start()
+        try:
+            results = self.analyze(text, metrics=metrics)
+        finally:
+            metrics.stop()
+        self.last_metrics = metrics
+        return results, metrics
+
+    def split_sentences(self, text):
+        """
+        Разбивает текст на предложения без синтаксического анализа.
+
+        Args:
+            text (str): Входной текст.
+
+        Returns:
+            list: Подстроки Natasha (start, stop, text) для каждого предложения.
+        """
+        self.load()
+        return list(self.segmenter.sentenize(text))
+
+    def iter_analyze(self, text, batch_size=1, first_sentence=1, metrics=None):
+        """
+        Потоково анализирует текст, выдавая дерево каждого предложения сразу после разбора.
+
+        Текст сегментируется постепенно, а синтаксический анализ выполняется
+        небольшими пачками предложений, поэтому память не растет с размером документа.
+
+        Args:
+            text (str): Входной текст для анализа.
+            batch_size (int): Количество предложений, разбираемых за один проход.
+            first_sentence (int): Номер первого предложения в идентификаторах узлов.
+            metrics (AnalysisMetrics, optional): Объект, в который добавляются замеры.
+                Если не указан, метрики сохраняются в last_metrics после выдачи всех деревьев,
+                а время, пока потребитель обрабатывает выданное дерево, не учитывается.
+
+        Yields:
+            SyntaxTree: Дерево очередного предложения.
+
+        Raises:
+            ValueError: Если входной текст пустой.
+            Exception: Если произошла ошибка при анализе.
+        """
+        try:
+            if not text or not text.strip():
+                raise ValueError("Входной текст пуст")
+
+            self.load()
+            owned = metrics is None
+            with self._measure(metrics) as metrics:
+                number = first_sentence
+                batch = []
+                for sentence in self.segmenter.sentenize(text):
+                    batch.append(sentence)
+                    if len(batch) >= batch_size:
+                        trees = self._analyze_chunk(text[batch[0].start:batch[-1].stop], number, metrics)
+                        number += len(trees)
+                        batch = []
+                        yield from self._emit(trees, metrics if owned else None)
+                if batch:
+                    trees = self._analyze_chunk(text[batch[0].start:batch[-1].stop], number, metrics)
+                    yield from self._emit(trees, metrics if owned else None)
+
+        except Exception as e:
+            raise Exception(f"Ошибка при синтаксическом анализе: {str(e)}")
+
+    def iter_analyze_sentences(self, sentences, first_sentence=1):
+        """
+        Анализирует уже выделенные предложения (см. split_sentences) без повторной сегментации текста.
+
+        Args:
+            sentences (iterable): Подстроки Natasha с полем text.
+            first_sentence (int): Номер первого предложения в идентификаторах узлов.
+
+        Yields:
+            SyntaxTree: Дерево очередного предложения.
+
+        Raises:
+            Exception: Если произошла ошибка при анализе.
+        """
+        try:
+            self.load()
+            number = first_sentence
+            for sentence in sentences:
+                trees = self._analyze_chunk(sentence.text, number)
+                number += len(trees)
+                yield from trees
+
+        except Exception as e:
+            raise Exception(f"Ошибка при синтаксическом анализе: {str(e)}")
+
+    def iter_analyze_paragraphs(self, paragraphs, batch_size=None, metrics=None):
+        """
+        Потоково анализирует текст, поступающий абзацами (например, из iter_rtf_paragraphs).
+        Нумерация предложений сквозная для всех абзацев.
+
+        Абзацы собираются в окна примерно по batch_size предложений, и каждое окно
+        анализируется одним проходом (как абзацы, соединенные переводом строки), поэтому
+        синтаксический анализ выполняется пачками, а память не растет с размером файла.
+
+        Args:
+            paragraphs (iterable): Строки абзацев.
+            batch_size (int, optional): Предложений в окне (по умолчанию — syntax_batch_size).
+            metrics (AnalysisMetrics, optional): Объект, в который добавляются замеры
+                (см. iter_analyze).
+
+        Yields:
+            SyntaxTree: Дерево очередного предложения.
+
+        Raises:
+            Exception: Если произошла ошибка при анализе.
+        """
+        batch_size = batch_size or self.syntax_batch_size
+        try:
+            self.load()
+            owned = metrics is None
+            with self._measure(metrics) as metrics:
+                number = 1
+                window = []
+                count = 0
+                for paragraph in paragraphs:
+                    if not paragraph.strip():
+                        continue
+                    window.append(paragraph)
+                    count += sum(1 for _ in self.segmenter.sentenize(paragraph))
+                    if count >= batch_size:
+                        trees = self._analyze_chunk('\n'.join(window), number, metrics)
+                        number += len(trees)
+                        window = []
+                        count = 0
+                        yield from self._emit(trees, metrics if owned else None)
+                if window:
+                    trees = self._analyze_chunk('\n'.join(window), number, metrics)
+                    yield from self._emit(trees, metrics if owned else None)
+
+        except Exception as e:
+            raise Exception(f"Ошибка при синтаксическом анализе: {str(e)}")
+
+    @staticmethod
+    def _emit(trees, metrics=None):
+        """
+        Выдает деревья, приостанавливая собственный замер metrics, пока потребитель
+        обрабатывает очередное дерево.
+        """
+        for tree in trees:
+            if metrics is not None:
+                metrics.pause()
+            try:
+                yield tree
+            finally:
+                if metrics is not None:
+                    metrics.resume()
+
+    @contextmanager
+    def _measure(self, metrics):
+        """
+        Оборачивает запуск анализа: учитывает обращения к кэшам морфологии и определений,
+        а для собственного объекта метрик — общее время, профиль и вызов metrics_callback.
+        """
+        owned = metrics is None
+        if owned:
+            metrics = self.new_metrics()
+            metrics.start()
+        morph_hits, morph_misses = self.morph.hits, self.morph.misses
+        definitions = self.semantic_analyzer.resolve_definition.cache_info()
+        try:
+            yield metrics
+        finally:
+            metrics.count('morph_cache_hits', self.morph.hits - morph_hits)
+            metrics.count('morph_cache_misses', self.morph.misses - morph_misses)
+            info = self.semantic_analyzer.resolve_definition.cache_info()
+            metrics.count('definition_cache_hits', info.hits - definitions.hits)
+            metrics.count('wordnet_lookups', info.misses - definitions.misses)
+            if owned:
+                metrics.stop()
+                self.last_metrics = metrics
+        if owned and self.metrics_callback is not None:
+            self.metrics_callback(metrics)
+
+    def analyze_batch(self, texts, metrics=None):
+        """
+        Анализирует несколько независимых текстов за один проход: сегментация и нумерация
+        предложений выполняются для каждого текста отдельно, а морфологический и синтаксический
+        анализ — общими пачками для всех текстов.
+
+        Args:
+            texts (list): Непустые тексты.
+            metrics (AnalysisMetrics, optional): Объект, в который добавляются замеры.
+
+        Returns:
+            list: Для каждого текста — список объектов SyntaxTree.
+
+        Raises:
+            ValueError: Если один из текстов пустой.
+            Exception: Если произошла ошибка при анализе.
+        """
+        try:
+            if any(not text or not text.strip() for text in texts):
+                raise ValueError("Входной текст пуст")
+
+            self.load()
+            with self._measure(metrics) as metrics:
+                return self._analyze_docs(texts, metrics)
+
+        except Exception as e:
+            raise Exception(f"Ошибка при синтаксическом анализе: {str(e)}")
+
+    def _analyze_chunk(self, text, first_sentence=1, metrics=None):
+        """
+        Анализирует фрагмент текста целиком.
+
+        Args:
+            text (str): Фрагмент текста из одного или нескольких предложений.
+            first_sentence (int): Номер первого предложения фрагмента в документе.
+            metrics (AnalysisMetrics, optional): Объект для замеров по этапам.
+
+        Returns:
+            list: Список объектов SyntaxTree для предложений фрагмента.
+        """
+        return self._analyze_docs([text], metrics, first_sentence)[0]
+
+    def _analyze_docs(self, texts, metrics=None, first_sentence=1):
+        """
+        Анализирует тексты, объединяя их предложения в общие пачки синтаксического анализа.
+
+        Args:
+            texts (list): Тексты.
+            metrics (AnalysisMetrics, optional): Объект для замеров по этапам.
+            first_sentence (int): Номер первого предложения каждого текста.
+
+        Returns:
+            list: Для каждого текста — список объектов SyntaxTree.
+        """
+        from natasha import Doc
+        if metrics is None:
+            metrics = AnalysisMetrics()
+
+        # Создание объектов Doc для обработки текста и сегментация на предложения
+        with metrics.stage('segmentation'):
+            docs = [Doc(text) for text in texts]
+            for doc in docs:
+                doc.segment(self.segmenter)
+
+        # Морфологический анализ с использованием pymorphy2: один разбор на уникальную словоформу
+        with metrics.stage('morphology'):
+            morph_table = self.morph.describe_forms(token.text for doc in docs for token in doc.tokens)
+            for doc in docs:
+                for token in doc.tokens:
+                    token.pos = morph_table[token.text].pos
+
+        # Синтаксический анализ пачками ограниченного размера
+        sents = []
+        numbers = []
+        for doc in docs:
+            sents.extend(doc.sents)
+            numbers.extend(range(1, len(doc.sents) + 1))
+        with metrics.stage('syntax'):
+            metrics.count('syntax_batches', self._parse_syntax(sents, numbers))
+
+        metrics.count('sentences', len(sents))
+        metrics.count('tokens', sum(len(doc.tokens) for doc in docs))
+        metrics.count('word_forms', len(morph_table))
+
+        # Формирование списков синтаксических деревьев с переводом тегов и семантикой
+        return [[self._build_tree(sent, morph_table, first_sentence - 1, metrics) for sent in doc.sents]
+                for doc in docs]
+
+    def _parse_syntax(self, sents, numbers=None):
+        """
+        Выполняет синтаксический анализ предложений пачками (см. syntax_batches)
+        и записывает в токены идентификаторы, вершины и связи так же, как Doc.parse_syntax.
+
+        Args:
+            sents (list): Предложения Natasha после сегментации.
+            numbers (list, optional): Номера предложений в их документах (по умолчанию 1, 2, ...).
+
+        Returns:
+            int: Количество пачек.
+        """
+        batches = syntax_batches([len(sent.tokens) for sent in sents], self.syntax_batch_size,
+                                 self.syntax_batch_tokens, self.sort_syntax_batches)
+        for batch in batches:
+            words = [[token.text for token in sents[i].tokens] for i in batch]
+            for i, markup in zip(batch, self.syntax_parser.map(words)):
+                sent_id = numbers[i] if numbers is not None else i + 1
+                for token, markup_token in zip(sents[i].tokens, markup.tokens):
+                    token.id = f"{sent_id}_{markup_token.id}"
+                    token.head_id = f"{sent_id}_{markup_token.head_id}"
+                    token.rel = markup_token.rel
+        return len(batches)
+
+    def _build_tree(self, sent, morph_table, sentence_offset=0, metrics=None):
+        """
+        Строит синтаксическое дерево предложения с переводом тегов и семантикой.
+
+        Args:
+            sent: Предложение Natasha после синтаксического анализа.
+            morph_table (dict): Словоформа → MorphInfo для всех форм документа.
+            sentence_offset (int): Сдвиг номера предложения в идентификаторах узлов.
+            metrics (AnalysisMetrics, optional): Объект для замеров по этапам.
+
+        Returns:
+            SyntaxTree: Дерево предложения.
+        """
+        if metrics is None:
+            metrics = AnalysisMetrics()
+        tokens = sent.tokens
+        with metrics.stage('lemmatization'):
+            infos = [morph_table[token.text] for token in tokens]
+        with metrics.stage('roles'):
+            pos_codes = encode_pos_tags([token.pos for token in tokens])
+            rel_codes = encode_rel_tags([token.rel for token in tokens])
+            roles = self.semantic_analyzer.assign_roles(pos_codes, rel_codes)
+        poses = [POS_LABELS[pos_code] for pos_code in pos_codes]
+        rels = [REL_LABELS[rel_code] for rel_code in rel_codes]
+        with metrics.stage('word_meaning'):
+            meanings = [
+                self.semantic_analyzer.get_word_meaning(info.lemma, pos, rel, token.text, is_name=info.is_name)
+                for token, info, pos, rel in zip(tokens, infos, poses, rels)
+            ]
+        with metrics.stage('tree'):
+            tree = self.tree_class()
+            for token, info, pos, rel, semantic_role, word_meaning in zip(tokens, infos, poses, rels,
+                                                                         roles, meanings):
+                tree.add_node(
+                    node_id=shift_node_id(token.id, sentence_offset),
+                    text=token.text,
+                    pos=pos,
+                    head_id=shift_node_id(token.head_id, sentence_offset),
+                    rel=rel,
+                    lemma=info.lemma,
+                    semantic_role=semantic_role,
+                    word_meaning=word_meaning
+                )
+        return tree
+
+
+def syntax_batches(lengths, batch_size=SYNTAX_BATCH_SIZE, max_tokens=SYNTAX_BATCH_TOKENS, sort=True):
+    """
+    Делит предложения на пачки для синтаксического анализа.
+
+    Args:
+        lengths (list): Длины предложений в токенах.
+        batch_size (int): Максимум предложений в пачке.
+        max_tokens (int, optional): Максимум токенов в пачке; предложение длиннее
+            ограничения образует отдельную пачку.
+        sort (bool): Упорядочить предложения по длине перед делением.
+
+    Returns:
+        list: Списки номеров предложений (с нуля) для каждой пачки.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__) if sort else range(len(lengths))
+    batches = []
+    batch = []
+    tokens = 0
+    for i in order:
+        if batch and (len(batch) >= batch_size or (max_tokens and tokens + lengths[i] > max_tokens)):
+            batches.append(batch)
+            batch = []
+            tokens = 0
+        batch.append(i)
+        tokens += lengths[i]
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def shift_node_id(node_id, sentence_offset):
+    """
+    Сдвигает номер предложения в идентификаторе узла вида "<предложение>_<токен>".
+
+    Args:
+        node_id (str): Идентификатор узла.
+        sentence_offset (int): Величина сдвига.
+
+    Returns:
+        str: Идентификатор с новым номером предложения.
+    """
+    if not sentence_offset or not node_id:
+        return node_id
+    sentence, _, token = node_id.partition('_')
+    return f"{int(sentence) + sentence_offset}_{token}"
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import sys
+
+
+class DefinitionIndex:
+    """
+    Компактный индекс «лемма → определение», построенный из RuWordNet.
+    """
+    def __init__(self, index_path):
+        """
+        Открывает индекс только для чтения.
+
+        Args:
+            index_path (str): Путь к файлу индекса SQLite.
+
+        Raises:
+            FileNotFoundError: Если файл индекса не найден.
+        """
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"Файл индекса {index_path} не найден")
+        self.index_path = index_path
+        self.conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def lookup(self, lemma):
+        """
+        Ищет лемму в индексе.
+
+        Args:
+            lemma (str): Лемма в нижнем регистре.
+
+        Returns:
+            tuple: (найдена ли лемма, определение или None).
+        """
+        row = self.conn.execute(
+            "SELECT definition FROM definitions WHERE lemma = ?", (lemma,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        return True, row[0]
+
+    def close(self):
+        """
+        Закрывает соединение с индексом.
+        """
+        self.conn.close()
+
+
+def build_definition_index(index_path, wn=None):
+    """
+    Строит индекс «лемма → первое непустое определение» по всем смыслам RuWordNet.
+
+    Лемма попадает в индекс, даже если ни у одного из ее синсетов нет определения,
+    чтобы поиск по индексу давал тот же результат, что и обход синсетов.
+
+    Args:
+        index_path (str): Путь к создаваемому файлу индекса.
+        wn (RuWordNet, optional): Готовый экземпляр RuWordNet.
+
+    Returns:
+        int: Количество лемм в индексе.
+    """
+    if wn is None:
+        from ruwordnet import RuWordNet
+        wn = RuWordNet()
+    from ruwordnet.models import Sense
+
+    definitions = {}
+    for sense in wn.session.query(Sense):
+        lemma = sense.lemma.lower()
+        definition = sense.synset.definition if sense.synset else None
+        if not definitions.get(lemma) and definition:
+            definitions[lemma] = definition
+        else:
+            definitions.setdefault(lemma, None)
+
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    conn = sqlite3.connect(index_path)
+    try:
+        conn.execute("CREATE TABLE definitions (lemma TEXT PRIMARY KEY, definition TEXT) WITHOUT ROWID")
+        conn.executemany("INSERT INTO definitions VALUES (?, ?)", definitions.items())
+        conn.commit()
+    finally:
+        conn.close()
+    return len(definitions)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Использование: python wordnet_index.py <путь к индексу>")
+        sys.exit(1)
+    count = build_definition_index(sys.argv[1])
+    print(f"Индекс построен: {count} лемм")
@@ -0,0 +1,110 @@
+import gc
+import multiprocessing
+import sys
+
+SMAPS_FIELDS = {
+    'Rss': 'rss_mb',
+    'Pss': 'pss_mb',
+    'Shared_Clean': 'shared_mb',
+    'Shared_Dirty': 'shared_mb',
+    'Private_Clean': 'private_mb',
+    'Private_Dirty': 'private_mb'
+}
+
+
+def fork_available():
+    """
+    Проверяет, поддерживает ли платформа запуск процессов через fork.
+    """
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def share_models_default():
+    """
+    Решает, разделять ли загруженные модели между процессами по умолчанию.
+
+    Включено только в Linux: в macOS fork после загрузки библиотек небезопасен
+    (системные фреймворки не поддерживают fork без exec), а в Windows fork недоступен.
+    На других платформах совместное использование можно включить явно.
+    """
+    return sys.platform.startswith('linux') and fork_available()
+
+
+def fork_context():
+    """
+    Возвращает контекст multiprocessing, порождающий процессы через fork.
+    """
+    return multiprocessing.get_context('fork')
+
+
+def preload_analyzer(definition_index=None, **options):
+    """
+    Загружает анализатор в родительском процессе для совместного использования
+    дочерними процессами после fork.
+
+    Таблицы эмбеддингов Natasha, словари pymorphy2 и модель синтаксического анализатора
+    наследуются дочерними процессами и остаются общими страницами памяти, пока их не
+    изменяют. Чтобы сборщик мусора не переписывал заголовки этих объектов в дочерних
+    процессах, все объекты после загрузки переносятся в постоянное поколение (gc.freeze).
+    Соединения SQLite с RuWordNet закрываются: их нельзя передавать через fork,
+    дочерние процессы открывают свои (см. SemanticAnalyzer.reconnect).
+
+    Args:
+        definition_index (str, optional): Путь к индексу определений RuWordNet.
+        **options: Дополнительные параметры TextAnalyzer.
+
+    Returns:
+        TextAnalyzer: Загруженный анализатор.
+    """
+    from text_analyzer import TextAnalyzer
+    analyzer = TextAnalyzer(definition_index=definition_index, **options)
+    analyzer.semantic_analyzer.close()
+    gc.collect()
+    gc.freeze()
+    return analyzer
+
+
+def memory_rollup(pid='self'):
+    """
+    Возвращает сводку памяти процесса из /proc/<pid>/smaps_rollup (Linux).
+
+    Args:
+        pid (int or str): Идентификатор процесса или 'self'.
+
+    Returns:
+        dict: rss_mb, pss_mb, shared_mb (страницы, общие с другими процессами) и private_mb
+            (собственные страницы процесса) либо None, если сведения недоступны.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    rollup = dict.fromkeys(SMAPS_FIELDS.values(), 0.0)
+    for line in lines:
+        name, _, value = line.partition(':')
+        key = SMAPS_FIELDS.get(name)
+        if key is not None:
+            # Значения указаны в килобайтах
+            rollup[key] += int(value.split()[0]) / 1024
+    return rollup
+
+
+def format_memory_report(report):
+    """
+    Форматирует сводки памяти процессов в таблицу.
+
+    Args:
+        report (dict): Подпись процесса (например, PID) → результат memory_rollup.
+
+    Returns:
+        str: Текст таблицы (значения в мегабайтах).
+    """
+    lines = [f"{'Процесс':>10} {'RSS':>10} {'PSS':>10} {'Общая':>10} {'Своя':>10}"]
+    for name, rollup in report.items():
+        if rollup is None:
+            lines.append(f"{name!s:>10} {'нет данных':>10}")
+            continue
+        lines.append(f"{name!s:>10} {rollup['rss_mb']:>10.1f} {rollup['pss_mb']:>10.1f} "
+                     f"{rollup['shared_mb']:>10.1f} {rollup['private_mb']:>10.1f}")
+    return '\n'.join(lines)